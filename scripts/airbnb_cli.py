@@ -0,0 +1,281 @@
+"""
+Single entry point for the pipeline stages and the analysis/scoring tools.
+
+Every subcommand imports its dependencies only when it runs, so a scoring
+or statistics job never pays for matplotlib, seaborn or the model
+libraries it does not use. Like the stand-alone scripts, commands run from
+the 'scripts' directory; relative paths on the command line (including
+those passed through to a tool) are resolved from the directory the CLI
+was started in.
+
+    python airbnb_cli.py stage day_2 day_7 day_8
+    python airbnb_cli.py predict new_listings.csv --output scored.csv
+    python airbnb_cli.py segment-tests
+    python airbnb_cli.py startup-check --budget 2.0
+"""
+import argparse
+import importlib
+import json
+import os
+import runpy
+import subprocess
+import sys
+import time
+
+# instrumentation only needs the standard library, so the stage list is cheap to import
+from instrumentation import PIPELINE_STAGES, SCRIPTS_DIR
+
+# Tools run by calling a function in their module: command -> (module, function, help)
+TOOLS = {
+    'segment-tests': ('batched_hypothesis_tests', 'run_segment_hypothesis_tests',
+                      'Verified vs. unconfirmed host tests per borough/room-type segment.'),
+    'bootstrap': ('bootstrap_ci', 'run_bootstrap_report', 'Bootstrap confidence intervals for pricing insights.'),
+    'hosts': ('host_index', 'run_host_index_report', 'Power-host analytics from the host index.'),
+    'quantiles': ('quantile_model', 'train_quantile_model', 'Train the quantile price interval heads.'),
+    'profile': ('fast_profiling', 'main', 'Single-pass streaming profile of a data file.'),
+    'drift': ('drift_monitor', 'main', 'Check a batch of encoded listings for feature drift.'),
+    'backtest': ('backtesting', 'main', 'Rolling-origin backtest over review time.'),
+    'attribution': ('listing_attribution', 'main', 'Per-listing price attribution.'),
+    'comparables': ('comparables', 'main', 'Build or query the comparable-listings index.'),
+    'ingest': ('async_ingest', 'main', 'Concurrent multi-city, multi-snapshot ingest.'),
+    'synthetic': ('synthetic_data', 'main', 'Generate synthetic listings data.'),
+    'benchmark': ('benchmark_suite', 'main', 'Scaled pipeline benchmarks.'),
+    'trace': ('instrumentation', 'main', 'Pipeline profiling and trace comparison.'),
+}
+
+# Modules each lightweight command imports before doing any work
+COMMAND_IMPORTS = {
+    'cli': [],
+    'predict': ['numpy', 'pandas', 'joblib', 'prediction_cache', 'drift_monitor'],
+    'segment-tests': ['batched_hypothesis_tests'],
+    'hosts': ['host_index'],
+}
+
+# Packages that must not be loaded at startup of a lightweight command
+STARTUP_FORBIDDEN = {
+    'cli': ['numpy', 'pandas', 'matplotlib', 'seaborn', 'scipy', 'sklearn', 'xgboost', 'lightgbm'],
+    'predict': ['matplotlib', 'seaborn', 'scipy', 'sklearn', 'xgboost', 'lightgbm'],
+    'segment-tests': ['matplotlib', 'seaborn', 'sklearn', 'xgboost', 'lightgbm'],
+    'hosts': ['matplotlib', 'seaborn', 'scipy', 'sklearn', 'xgboost', 'lightgbm'],
+}
+
+MODEL_PATH = os.path.normpath(os.path.join(SCRIPTS_DIR, '..', 'models', 'stacked_price_predictor.joblib'))
+
+
+def load_command_modules(command):
+    """Imports the modules a lightweight command needs and returns them by name."""
+    return {name: importlib.import_module(name) for name in COMMAND_IMPORTS[command]}
+
+
+def run_stages(args):
+    if args.trace:
+        from instrumentation import run_pipeline
+        run_pipeline(args.stages, run_name=args.name)
+        return
+    for name in args.stages:
+        print(f"\n=== {name} ===")
+        runpy.run_path(os.path.join(SCRIPTS_DIR, PIPELINE_STAGES[name]), run_name='__main__')
+
+
+def run_tool(args):
+    module_name, function_name, _ = TOOLS[args.command]
+    if function_name != 'main' and args.tool_args:
+        print(f"Error: '{args.command}' takes no arguments.")
+        return 2
+    module = importlib.import_module(module_name)
+    if function_name == 'main':
+        # Hand the remaining arguments to the tool's own parser
+        sys.argv = [f'{module_name}.py', *args.tool_args]
+        module.main()
+    else:
+        getattr(module, function_name)()
+
+
+def run_predict(args):
+    """Scores encoded listings in batches through the prediction cache and drift monitor."""
+    modules = load_command_modules('predict')
+    np, pd, joblib = modules['numpy'], modules['pandas'], modules['joblib']
+    cache_module, drift_module = modules['prediction_cache'], modules['drift_monitor']
+
+    if not os.path.exists(args.model):
+        print(f"Error: Model not found at '{args.model}'. Please run the Day 8 script first.")
+        return 1
+    if not os.path.exists(args.input):
+        print(f"Error: Input file not found at '{args.input}'")
+        return 1
+
+    start = time.perf_counter()
+    model = joblib.load(args.model)
+    print(f"Loaded model in {time.perf_counter() - start:.2f}s.")
+
+    scorer = model
+    if not args.no_cache:
+        scorer = cache_module.PredictionCache.for_model(
+            model, args.model, shared_path=cache_module.SHARED_CACHE_PATH if args.shared_cache else None)
+    monitor = None
+    if not args.no_drift and os.path.exists(drift_module.REFERENCE_PATH):
+        monitor = drift_module.DriftMonitor(drift_module.DriftReference.load(drift_module.REFERENCE_PATH))
+    intervals = None
+    if args.intervals:
+        from quantile_model import IntervalPricePredictor
+        intervals = IntervalPricePredictor.load(point_model_path=None)
+
+    columns = list(getattr(model, 'feature_names_in_', []))
+    rows = 0
+    start = time.perf_counter()
+    for i, batch in enumerate(pd.read_csv(args.input, chunksize=args.batch_size)):
+        X = batch.reindex(columns=columns, fill_value=0) if columns else batch
+        scored = pd.DataFrame({'predicted_price': np.expm1(drift_module.monitored_predict(scorer, X, monitor))},
+                              index=batch.index)
+        if intervals is not None:
+            scored = scored.join(intervals.predict_prices(X))
+        scored.to_csv(args.output, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        rows += len(batch)
+    elapsed = time.perf_counter() - start
+
+    print(f"Scored {rows} listings in {elapsed:.2f}s; predictions saved to '{args.output}'")
+    if hasattr(scorer, 'stats'):
+        print(f"Prediction cache: {scorer.stats()}")
+    if monitor is not None:
+        print(f"Drift check: {monitor.summary()}")
+    return 0
+
+
+def _measure_startup(command):
+    """
+    Times the imports of `command` in a fresh interpreter and lists the
+    top-level packages that ended up loaded.
+    """
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import airbnb_cli\n"
+        f"airbnb_cli.load_command_modules({command!r})\n"
+        "seconds = time.perf_counter() - start\n"
+        "print(json.dumps({'seconds': seconds, 'modules': sorted({m.split('.')[0] for m in sys.modules})}))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        error = (result.stderr.strip().splitlines() or ['unknown error'])[-1]
+        return {'seconds': float('nan'), 'modules': [], 'error': error}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def startup_check(commands=None, budget=2.0, cli_budget=0.2, repeats=3):
+    """
+    Startup-time budget check: each lightweight command must finish its
+    imports within the budget (best of `repeats` cold interpreters) and
+    must not load the heavy packages listed in STARTUP_FORBIDDEN.
+    Returns a non-zero exit code on any violation.
+    """
+    commands = commands or list(COMMAND_IMPORTS)
+    unknown = [c for c in commands if c not in COMMAND_IMPORTS]
+    if unknown:
+        print(f"Error: No startup budget defined for {unknown}. Choose from {list(COMMAND_IMPORTS)}.")
+        return 2
+
+    failures = 0
+    print(f"{'command':<15} {'seconds':>8} {'budget':>7}  status")
+    for command in commands:
+        runs = [_measure_startup(command) for _ in range(repeats)]
+        if 'error' in runs[0]:
+            failures += 1
+            print(f"{command:<15} {'-':>8} {'-':>7}  import failed: {runs[0]['error']}")
+            continue
+        seconds = min(run['seconds'] for run in runs)
+        allowed = cli_budget if command == 'cli' else budget
+        loaded = sorted(set(STARTUP_FORBIDDEN[command]) & set(runs[0]['modules']))
+        problems = []
+        if seconds > allowed:
+            problems.append('over budget')
+        if loaded:
+            problems.append(f"loads {', '.join(loaded)}")
+        failures += bool(problems)
+        print(f"{command:<15} {seconds:8.3f} {allowed:7.2f}  {'; '.join(problems) or 'ok'}")
+    return 1 if failures else 0
+
+
+def run_startup_check(args):
+    return startup_check(args.commands, args.budget, args.cli_budget, args.repeats)
+
+
+def _resolve_path_arg(arg, cwd):
+    """
+    Makes a relative path argument absolute with respect to `cwd`. An
+    argument counts as a path when it exists there, contains a directory
+    separator or has a file extension; options, numbers and plain words
+    (subcommands, stage names) are left alone. '--opt=value' is handled too.
+    """
+    if arg.startswith('-'):
+        option, sep, value = arg.partition('=')
+        return f"{option}={_resolve_path_arg(value, cwd)}" if sep and value else arg
+    if not arg or os.path.isabs(arg):
+        return arg
+    try:
+        float(arg)
+        return arg
+    except ValueError:
+        pass
+    candidate = os.path.join(cwd, arg)
+    if os.path.exists(candidate) or os.sep in arg or '/' in arg or os.path.splitext(arg)[1]:
+        return os.path.normpath(candidate)
+    return arg
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Airbnb NYC analysis and pricing pipeline.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stage_parser = subparsers.add_parser('stage', help='Run pipeline stages (day_1 .. day_9) in order.')
+    stage_parser.add_argument('stages', nargs='+', choices=list(PIPELINE_STAGES))
+    stage_parser.add_argument('--trace', action='store_true', help='Run under the pipeline tracer.')
+    stage_parser.add_argument('--name', default=None, help='Run name for the trace file.')
+    stage_parser.set_defaults(handler=run_stages)
+
+    predict_parser = subparsers.add_parser('predict', help='Score encoded listings with the stacked model.')
+    predict_parser.add_argument('input', help='CSV with the model_features.csv columns.')
+    predict_parser.add_argument('--output', default='predictions.csv')
+    predict_parser.add_argument('--model', default=MODEL_PATH)
+    predict_parser.add_argument('--batch-size', type=int, default=50_000)
+    predict_parser.add_argument('--intervals', action='store_true', help='Add the quantile price interval.')
+    predict_parser.add_argument('--no-cache', action='store_true')
+    predict_parser.add_argument('--shared-cache', action='store_true',
+                                help='Use the SQLite cache shared between worker processes.')
+    predict_parser.add_argument('--no-drift', action='store_true')
+    predict_parser.set_defaults(handler=run_predict)
+
+    check_parser = subparsers.add_parser('startup-check', help='Check import time of the lightweight commands.')
+    check_parser.add_argument('commands', nargs='*', help=f"Commands to check (default: all of {list(COMMAND_IMPORTS)}).")
+    check_parser.add_argument('--budget', type=float, default=2.0, help='Seconds allowed per command.')
+    check_parser.add_argument('--cli-budget', type=float, default=0.2, help='Seconds allowed for the bare CLI.')
+    check_parser.add_argument('--repeats', type=int, default=3)
+    check_parser.set_defaults(handler=run_startup_check)
+
+    # Listed for --help only; main() hands tool arguments over before parsing
+    for command, (_, _, help_text) in TOOLS.items():
+        subparsers.add_parser(command, help=help_text, add_help=False).set_defaults(handler=run_tool)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in TOOLS:
+        # Everything after the tool name (including --help) belongs to the tool's own parser
+        args = argparse.Namespace(command=argv[0], tool_args=argv[1:], handler=run_tool)
+    else:
+        args = build_parser().parse_args(argv)
+    # User-supplied file paths are taken relative to where the CLI was started
+    cwd = os.getcwd()
+    for attr in ('input', 'output', 'model'):
+        if getattr(args, attr, None):
+            setattr(args, attr, os.path.abspath(getattr(args, attr)))
+    if getattr(args, 'tool_args', None):
+        args.tool_args = [_resolve_path_arg(arg, cwd) for arg in args.tool_args]
+    os.chdir(SCRIPTS_DIR)
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    return args.handler(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
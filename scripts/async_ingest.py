@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+
+from day_2_data_cleaning import clean_dataframe
+
+SOURCE_EXTENSIONS = ('.csv', '.xlsx', '.parquet')
+DEFAULT_OUTPUT_ROOT = '../data/processed/ingested'
+
+# '<city>_<YYYY-MM-DD>.<ext>', e.g. 'new-york-city_2023-01-01.xlsx'
+FILENAME_PATTERN = re.compile(r'^(?P<city>[A-Za-z][\w-]*?)[_-](?P<snapshot>\d{4}-\d{2}-\d{2})$')
+
+
+@dataclass
+class SourceFile:
+    path: str
+    city: str
+    snapshot_date: str
+
+
+def _parse_source(root, path):
+    """
+    Derives city and snapshot date from Hive-style directories
+    ('city=<c>/snapshot_date=<d>/...') or from the file name.
+    """
+    parts = dict(p.split('=', 1) for p in os.path.relpath(path, root).split(os.sep)[:-1] if '=' in p)
+    city = parts.get('city')
+    snapshot = parts.get('snapshot_date') or parts.get('snapshot')
+    match = FILENAME_PATTERN.match(os.path.splitext(os.path.basename(path))[0])
+    if match:
+        city = city or match.group('city')
+        snapshot = snapshot or match.group('snapshot')
+    if not city or not snapshot:
+        return None
+    return SourceFile(path=path, city=city.lower(), snapshot_date=snapshot)
+
+
+def discover_sources(root):
+    """
+    Lists the city/snapshot source files under `root` (a local directory or
+    a mounted object-store stand-in). Files whose city or snapshot date
+    cannot be determined are reported and skipped.
+    """
+    sources, skipped = [], []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(SOURCE_EXTENSIONS):
+                continue
+            path = os.path.join(dirpath, filename)
+            source = _parse_source(root, path)
+            (sources if source else skipped).append(source or path)
+    return sorted(sources, key=lambda s: (s.city, s.snapshot_date, s.path)), skipped
+
+
+def _read_source(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.xlsx':
+        return pd.read_excel(path)
+    if extension == '.parquet':
+        return pd.read_parquet(path)
+    df = pd.read_csv(path, low_memory=False)
+    # CSV exports carry review dates as text; Day 2 filters on real dates
+    for col in df.columns:
+        if col.strip().lower().replace(' ', '_') == 'last_review':
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+
+def decode_and_clean(path, quiet=True):
+    """
+    Worker task: reads one source file and applies the Day 2 cleaning.
+    Returns the cleaned frame with the raw and cleaned row counts.
+    """
+    start = time.perf_counter()
+    df = _read_source(path)
+    rows_in = len(df)
+    output = io.StringIO() if quiet else None
+    with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+        df = clean_dataframe(df)
+    return df, rows_in, time.perf_counter() - start
+
+
+def write_partition(df, output_root, source):
+    """
+    Writes one cleaned source as a part file of the
+    'city=<c>/snapshot_date=<d>/' partition (Parquet when available). The
+    part is named after the source file, so re-ingesting a source replaces
+    its earlier output instead of adding a duplicate.
+    """
+    partition_dir = os.path.join(output_root, f'city={source.city}', f'snapshot_date={source.snapshot_date}')
+    os.makedirs(partition_dir, exist_ok=True)
+    try:
+        import pyarrow  # noqa: F401
+        extension = 'parquet'
+    except ImportError:
+        extension = 'csv'
+
+    part_name = 'part-' + hashlib.sha1(os.path.abspath(source.path).encode('utf-8')).hexdigest()[:16]
+    final_path = os.path.join(partition_dir, f'{part_name}.{extension}')
+    temp_path = final_path + '.tmp'
+    if extension == 'parquet':
+        df.to_parquet(temp_path, index=False)
+    else:
+        df.to_csv(temp_path, index=False)
+    # Readers never see a half-written part file
+    os.replace(temp_path, final_path)
+    # A previous run may have written this source in the other format
+    stale_path = os.path.join(partition_dir, f"{part_name}.{'csv' if extension == 'parquet' else 'parquet'}")
+    if os.path.exists(stale_path):
+        os.remove(stale_path)
+    return final_path
+
+
+async def ingest_sources(sources, output_root=DEFAULT_OUTPUT_ROOT, max_workers=4, max_pending=4,
+                         executor='process'):
+    """
+    Decodes and cleans the sources concurrently and writes them to the
+    partitioned output.
+
+    Backpressure: at most `max_workers` files are being decoded (or waiting
+    to hand over their result) and at most `max_pending` cleaned frames sit
+    in the queue in front of the writer, so memory is bounded by
+    `max_workers + max_pending + 1` frames regardless of the number of sources.
+    """
+    loop = asyncio.get_running_loop()
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    queue = asyncio.Queue(maxsize=max_pending)
+    decode_slots = asyncio.Semaphore(max_workers)
+    manifest = []
+
+    with pool_class(max_workers=max_workers) as decode_pool, ThreadPoolExecutor(max_workers=1) as write_pool:
+
+        async def produce(source):
+            async with decode_slots:
+                try:
+                    df, rows_in, seconds = await loop.run_in_executor(
+                        decode_pool, decode_and_clean, source.path, executor == 'process')
+                except Exception as e:
+                    manifest.append({'source': source.path, 'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+                    print(f"  [error] {source.path}: {e}")
+                    return
+                # Holding the slot until the queue accepts the frame is what bounds memory
+                await queue.put((source, df, rows_in, seconds))
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    queue.task_done()
+                    return
+                source, df, rows_in, seconds = item
+                try:
+                    path = await loop.run_in_executor(write_pool, write_partition, df, output_root, source)
+                except Exception as e:
+                    # Keep draining the queue so blocked producers are released
+                    manifest.append({'source': source.path, 'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+                    print(f"  [error] writing {source.path}: {e}")
+                    queue.task_done()
+                    continue
+                manifest.append({
+                    'source': source.path, 'status': 'ok', 'city': source.city,
+                    'snapshot_date': source.snapshot_date, 'rows_in': rows_in, 'rows_out': len(df),
+                    'decode_seconds': round(seconds, 3), 'output': path,
+                })
+                print(f"  [{source.city} {source.snapshot_date}] {rows_in:,} -> {len(df):,} rows "
+                      f"({seconds:.2f}s) -> '{path}'")
+                del df
+                queue.task_done()
+
+        writer = asyncio.create_task(consume())
+        await asyncio.gather(*(produce(source) for source in sources))
+        await queue.put(None)
+        await writer
+
+    return manifest
+
+
+def run_ingest(source_root, output_root=DEFAULT_OUTPUT_ROOT, max_workers=4, max_pending=4, executor='process'):
+    """Discovers, cleans and writes every city/snapshot file under `source_root`."""
+    print("--- Multi-Source Ingest ---")
+    if not os.path.isdir(source_root):
+        print(f"Error: Source directory not found at '{source_root}'")
+        return []
+
+    sources, skipped = discover_sources(source_root)
+    print(f"Discovered {len(sources)} source files under '{source_root}'.")
+    for path in skipped:
+        print(f"  [skipped] cannot determine city/snapshot date for '{path}'")
+    if not sources:
+        return []
+
+    start = time.perf_counter()
+    manifest = asyncio.run(ingest_sources(sources, output_root, max_workers, max_pending, executor))
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(output_root, exist_ok=True)
+    manifest_path = os.path.join(output_root, '_manifest.json')
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    ok = [m for m in manifest if m['status'] == 'ok']
+    print(f"\nIngested {len(ok)}/{len(sources)} files ({sum(m['rows_out'] for m in ok):,} rows) "
+          f"in {elapsed:.2f}s.")
+    print(f"Manifest saved to '{manifest_path}'")
+    print("\n--- Multi-Source Ingest Complete ---")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent multi-city, multi-snapshot ingest.')
+    parser.add_argument('source_root', help='Directory (or object-store stand-in) holding the source files.')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_ROOT)
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent decode workers.')
+    parser.add_argument('--max-pending', type=int, default=4,
+                        help='Cleaned frames allowed to wait for the writer.')
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process')
+    args = parser.parse_args()
+    run_ingest(args.source_root, args.output, args.workers, args.max_pending, args.executor)
+
+
+if __name__ == '__main__':
+    main()
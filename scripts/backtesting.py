@@ -0,0 +1,205 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import mean_absolute_error, r2_score
+
+FEATURES_PATH = '../data/processed/model_features.csv'
+TARGET_PATH = '../data/processed/model_target.csv'
+CACHE_DIR = '../data/processed/feature_cache'
+SPLIT_PATH = '../data/processed/split_indices.npz'
+RESULTS_PATH = '../reports/backtest_results.csv'
+
+# Day 7 encodes review time as days before this date, with 9999 for "never reviewed"
+REFERENCE_DATE = pd.Timestamp('2023-01-01')
+TIME_COL = 'days_since_last_review'
+MISSING_DAYS = 9999
+
+
+def review_dates(days_since_last_review):
+    """Recovers 'last_review' from the Day 7 feature (NaT for never-reviewed listings)."""
+    days = np.asarray(days_since_last_review, dtype=np.float64)
+    dates = REFERENCE_DATE - pd.to_timedelta(np.where(days >= MISSING_DAYS, np.nan, days), unit='D')
+    return pd.DatetimeIndex(dates)
+
+
+def cached_feature_matrix(features_path=FEATURES_PATH, target_path=TARGET_PATH, cache_dir=CACHE_DIR):
+    """
+    Returns (X, y, columns) with X and y as read-only memory-mapped .npy
+    arrays. The cache is rebuilt only when the CSVs are newer than it, so
+    repeated backtests skip CSV parsing and parallel folds share one copy
+    of the matrix through the page cache.
+    """
+    x_path = os.path.join(cache_dir, 'X.npy')
+    y_path = os.path.join(cache_dir, 'y.npy')
+    columns_path = os.path.join(cache_dir, 'columns.json')
+    sources_mtime = max(os.path.getmtime(features_path), os.path.getmtime(target_path))
+    fresh = all(os.path.exists(p) and os.path.getmtime(p) >= sources_mtime for p in [x_path, y_path, columns_path])
+
+    if not fresh:
+        X = pd.read_csv(features_path)
+        y = pd.read_csv(target_path).iloc[:, 0]
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(x_path, X.to_numpy(dtype=np.float64))
+        np.save(y_path, y.to_numpy(dtype=np.float64))
+        with open(columns_path, 'w') as f:
+            json.dump(list(X.columns), f)
+
+    with open(columns_path) as f:
+        columns = json.load(f)
+    return np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r'), columns
+
+
+def _time_signature(days):
+    return hashlib.sha256(np.ascontiguousarray(days, dtype=np.float64).tobytes()).hexdigest()
+
+
+def time_holdout_indices(days_since_last_review, test_size=0.2):
+    """
+    Time-aware hold-out: the most recently reviewed `test_size` share of the
+    listings forms the test set. Never-reviewed listings stay in training.
+    """
+    days = np.asarray(days_since_last_review, dtype=np.float64)
+    n_test = int(round(len(days) * test_size))
+    dated = np.flatnonzero(days < MISSING_DAYS)
+    # Fewest days since the last review = most recent; stable sort keeps ties in row order
+    recent_first = dated[np.argsort(days[dated], kind='stable')]
+    test = np.sort(recent_first[:n_test])
+    train = np.setdiff1d(np.arange(len(days)), test)
+    return train, test
+
+
+def time_holdout_split(X, y, test_size=0.2, split_path=SPLIT_PATH):
+    """
+    Drop-in for `train_test_split(X, y, ...)` shared by Days 8 and 9. The
+    split indices are persisted once and reused as long as the feature
+    file's review times are unchanged, so every script evaluates on the
+    same hold-out set.
+    """
+    days = X[TIME_COL].to_numpy(dtype=np.float64)
+    signature = _time_signature(days)
+    train = test = None
+    if os.path.exists(split_path):
+        saved = np.load(split_path)
+        if str(saved['signature']) == signature and float(saved['test_size']) == test_size:
+            train, test = saved['train'], saved['test']
+
+    if train is None:
+        train, test = time_holdout_indices(days, test_size)
+        os.makedirs(os.path.dirname(split_path) or '.', exist_ok=True)
+        np.savez(split_path, train=train, test=test, signature=signature, test_size=test_size)
+
+    return X.iloc[train], X.iloc[test], y.iloc[train], y.iloc[test]
+
+
+def rolling_origin_folds(days_since_last_review, n_folds=5, initial_fraction=0.5):
+    """
+    Expanding-window folds over review time. The dated listings are ordered
+    by review date; the first `initial_fraction` forms the initial training
+    window and the rest is cut into `n_folds` consecutive test slices. Fold
+    k trains on everything reviewed before its slice (plus never-reviewed
+    listings) and tests on the slice. Returns (train_idx, test_idx, start, end).
+    """
+    days = np.asarray(days_since_last_review, dtype=np.float64)
+    dates = review_dates(days)
+    undated = np.flatnonzero(days >= MISSING_DAYS)
+    dated = np.flatnonzero(days < MISSING_DAYS)
+    # Oldest first: larger day counts are older reviews
+    ordered = dated[np.argsort(-days[dated], kind='stable')]
+
+    bounds = np.linspace(int(len(ordered) * initial_fraction), len(ordered), n_folds + 1).astype(np.int64)
+    folds = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop <= start:
+            continue
+        train = np.sort(np.concatenate([ordered[:start], undated]))
+        test = np.sort(ordered[start:stop])
+        folds.append((train, test, dates[ordered[start]], dates[ordered[stop - 1]]))
+    return folds
+
+
+def _build_model(model_name):
+    if model_name == 'stacked':
+        from day_8_stacked_ensemble_model import build_stacked_model
+        # Folds already run in parallel; keep each model single-threaded
+        return build_stacked_model(n_jobs=1)
+    if model_name == 'lgbm':
+        from lightgbm import LGBMRegressor
+        return LGBMRegressor(n_estimators=100, random_state=42, n_jobs=1, verbose=-1)
+    raise ValueError(f"Unknown model '{model_name}'. Choose 'stacked' or 'lgbm'.")
+
+
+def _run_fold(fold_id, X, y, train, test, model_name):
+    start = time.perf_counter()
+    model = _build_model(model_name)
+    model.fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - start
+
+    predicted = np.expm1(model.predict(X[test]))
+    actual = np.expm1(y[test])
+    return {
+        'fold': fold_id,
+        'train_rows': len(train),
+        'test_rows': len(test),
+        'mae': mean_absolute_error(actual, predicted),
+        'r2': r2_score(actual, predicted),
+        'fit_seconds': fit_seconds,
+        'total_seconds': time.perf_counter() - start,
+    }
+
+
+def run_backtest(n_folds=5, initial_fraction=0.5, model_name='stacked', n_jobs=-1, output_path=RESULTS_PATH):
+    """Rolling-origin backtest of the price model over review time."""
+    print("--- Rolling-Origin Backtest ---")
+
+    if not all(os.path.exists(p) for p in [FEATURES_PATH, TARGET_PATH]):
+        print("Error: Model-ready data files not found. Please run the Day 7 script first.")
+        return
+
+    start = time.perf_counter()
+    X, y, columns = cached_feature_matrix()
+    print(f"Loaded cached feature matrix {X.shape} in {time.perf_counter() - start:.2f}s.")
+
+    folds = rolling_origin_folds(X[:, columns.index(TIME_COL)], n_folds, initial_fraction)
+    print(f"\nEvaluating '{model_name}' on {len(folds)} expanding-window folds...")
+    start = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_run_fold)(i + 1, X, y, train, test, model_name)
+        for i, (train, test, _, _) in enumerate(folds)
+    )
+    wall_seconds = time.perf_counter() - start
+
+    report = pd.DataFrame(results)
+    report.insert(1, 'test_from', [f[2].date() for f in folds])
+    report.insert(2, 'test_to', [f[3].date() for f in folds])
+    print(report.round(3).to_string(index=False))
+    print("-" * 50)
+    print(f"Mean MAE: ${report['mae'].mean():.2f} (std ${report['mae'].std():.2f}); "
+          f"mean R²: {report['r2'].mean():.4f}")
+    print(f"Wall time: {wall_seconds:.1f}s for {report['total_seconds'].sum():.1f}s of fold work.")
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    report.to_csv(output_path, index=False)
+    print(f"Backtest results saved to '{output_path}'")
+    print("\n--- Rolling-Origin Backtest Complete ---")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rolling-origin backtest over last_review time.')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--initial-fraction', type=float, default=0.5,
+                        help='Share of dated listings in the first training window.')
+    parser.add_argument('--model', choices=['stacked', 'lgbm'], default='stacked')
+    parser.add_argument('--jobs', type=int, default=-1)
+    parser.add_argument('--output', default=RESULTS_PATH)
+    args = parser.parse_args()
+    run_backtest(args.folds, args.initial_fraction, args.model, args.jobs, args.output)
+
+
+if __name__ == '__main__':
+    main()
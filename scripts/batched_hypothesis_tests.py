@@ -0,0 +1,245 @@
+import pandas as pd
+import numpy as np
+from scipy import stats
+import os
+from data_store import load_cleaned_data, replace_values
+
+
+def _segment_codes(df, segment_cols):
+    """Factorizes the segment columns into one integer code per row."""
+    if not segment_cols:
+        return np.zeros(len(df), dtype=np.int64), pd.Index(['all'], name='segment')
+    grouped = df.groupby(segment_cols, sort=True, dropna=False, observed=True)
+    return grouped.ngroup().to_numpy(dtype=np.int64), grouped.size().index
+
+
+def _grouped_moments(values, cells, n_cells):
+    """
+    Computes count, mean and sample variance of every metric column for
+    every cell in two vectorized passes (sums, then centred squares).
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    counts = np.zeros((n_cells, values.shape[1]))
+    sums = np.zeros((n_cells, values.shape[1]))
+    np.add.at(counts, cells, valid)
+    np.add.at(sums, cells, filled)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        centred = np.where(valid, values - means[cells], 0.0)
+        sq_dev = np.zeros((n_cells, values.shape[1]))
+        np.add.at(sq_dev, cells, centred ** 2)
+        variances = sq_dev / (counts - 1)
+    return counts, means, variances
+
+
+def _welch_tests(n1, m1, v1, n2, m2, v2):
+    """Welch's unequal-variance t-test for arrays of independent comparisons."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        se1 = v1 / n1
+        se2 = v2 / n2
+        t_stat = (m1 - m2) / np.sqrt(se1 + se2)
+        dof = (se1 + se2) ** 2 / (se1 ** 2 / (n1 - 1) + se2 ** 2 / (n2 - 1))
+        p_value = 2 * stats.t.sf(np.abs(t_stat), dof)
+    invalid = (n1 < 2) | (n2 < 2)
+    t_stat[invalid] = np.nan
+    dof[invalid] = np.nan
+    p_value[invalid] = np.nan
+    return t_stat, dof, p_value
+
+
+def _mann_whitney_tests(values, seg_codes, is_second, n_segments):
+    """
+    Two-sided Mann-Whitney U tests (normal approximation with tie and
+    continuity correction) for every (segment, metric) pair at once.
+
+    All observations are flattened into one long array keyed by test id,
+    sorted once, and tie-averaged ranks are computed per test from the
+    sorted run boundaries.
+    """
+    n_rows, n_metrics = values.shape
+    n_tests = n_segments * n_metrics
+
+    flat_values = values.ravel()
+    test_ids = (seg_codes[:, None] * n_metrics + np.arange(n_metrics)[None, :]).ravel()
+    second = np.repeat(is_second, n_metrics)
+
+    keep = ~np.isnan(flat_values)
+    flat_values, test_ids, second = flat_values[keep], test_ids[keep], second[keep]
+
+    order = np.lexsort((flat_values, test_ids))
+    flat_values, test_ids, second = flat_values[order], test_ids[order], second[order]
+
+    n_obs = len(flat_values)
+    positions = np.arange(n_obs)
+
+    # Ordinal rank of each observation within its own test
+    test_sizes = np.bincount(test_ids, minlength=n_tests)
+    test_starts = np.concatenate([[0], np.cumsum(test_sizes)[:-1]])
+    ordinal = positions - test_starts[test_ids] + 1
+
+    # Runs of tied values within a test share the average of their ordinal ranks
+    new_run = np.ones(n_obs, dtype=bool)
+    if n_obs:
+        new_run[1:] = (test_ids[1:] != test_ids[:-1]) | (flat_values[1:] != flat_values[:-1])
+    run_ids = np.cumsum(new_run) - 1
+    run_sizes = np.bincount(run_ids)
+    run_first = ordinal[new_run]
+    ranks = (run_first + (run_first + run_sizes - 1)) / 2.0
+    ranks = ranks[run_ids]
+
+    run_tests = test_ids[new_run]
+    tie_term = np.bincount(run_tests, weights=run_sizes.astype(np.float64) ** 3 - run_sizes,
+                           minlength=n_tests)
+
+    first = ~second
+    n1 = np.bincount(test_ids[first], minlength=n_tests).astype(np.float64)
+    n2 = np.bincount(test_ids[second], minlength=n_tests).astype(np.float64)
+    rank_sum_1 = np.bincount(test_ids[first], weights=ranks[first], minlength=n_tests)
+
+    n_total = n1 + n2
+    u1 = rank_sum_1 - n1 * (n1 + 1) / 2.0
+    u2 = n1 * n2 - u1
+    mu = n1 * n2 / 2.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = np.sqrt(n1 * n2 / 12.0 * ((n_total + 1) - tie_term / (n_total * (n_total - 1))))
+        z = (np.maximum(u1, u2) - mu - 0.5) / sigma
+        p_value = np.minimum(2 * stats.norm.sf(z), 1.0)
+    invalid = (n1 == 0) | (n2 == 0) | (sigma == 0)
+    u1[invalid] = np.nan
+    p_value[invalid] = np.nan
+
+    return u1.reshape(n_segments, n_metrics), p_value.reshape(n_segments, n_metrics)
+
+
+def adjust_pvalues(p_values, method='fdr_bh'):
+    """
+    Adjusts p-values for multiple testing. Supports Benjamini-Hochberg
+    ('fdr_bh') and Bonferroni ('bonferroni'); NaN p-values are ignored.
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full(p_values.shape, np.nan)
+    tested = ~np.isnan(p_values)
+    p = p_values[tested]
+    m = len(p)
+    if m == 0:
+        return adjusted
+
+    if method == 'bonferroni':
+        adjusted[tested] = np.minimum(p * m, 1.0)
+    elif method == 'fdr_bh':
+        order = np.argsort(p)
+        scaled = p[order] * m / np.arange(1, m + 1)
+        # Enforce monotonicity from the largest p-value downwards
+        scaled = np.minimum.accumulate(scaled[::-1])[::-1]
+        result = np.empty(m)
+        result[order] = np.minimum(scaled, 1.0)
+        adjusted[tested] = result
+    else:
+        raise ValueError(f"Unsupported correction method '{method}'.")
+    return adjusted
+
+
+def batched_segment_tests(df, metrics, segment_cols, group_col='host_identity_verified',
+                          groups=('verified', 'unconfirmed'), correction='fdr_bh', alpha=0.05):
+    """
+    Compares two host groups on every metric within every segment using
+    Welch's t-test and the Mann-Whitney U test, computed for all tests in
+    one vectorized pass over grouped arrays, then corrects for multiple
+    testing across the whole batch.
+
+    Returns one row per (segment, metric) test.
+    """
+    data = df[df[group_col].isin(groups)]
+    seg_codes, seg_labels = _segment_codes(data, segment_cols)
+    n_segments = len(seg_labels)
+    n_metrics = len(metrics)
+
+    values = data[metrics].to_numpy(dtype=np.float64)
+    is_second = (data[group_col] == groups[1]).to_numpy()
+
+    # Cell = (segment, group); cells are laid out as segment * 2 + group
+    cells = seg_codes * 2 + is_second.astype(np.int64)
+    counts, means, variances = _grouped_moments(values, cells, n_segments * 2)
+    counts = counts.reshape(n_segments, 2, n_metrics)
+    means = means.reshape(n_segments, 2, n_metrics)
+    variances = variances.reshape(n_segments, 2, n_metrics)
+
+    n1, n2 = counts[:, 0, :], counts[:, 1, :]
+    m1, m2 = means[:, 0, :], means[:, 1, :]
+    v1, v2 = variances[:, 0, :], variances[:, 1, :]
+
+    t_stat, dof, welch_p = _welch_tests(n1, m1, v1, n2, m2, v2)
+    mw_u, mw_p = _mann_whitney_tests(values, seg_codes, is_second, n_segments)
+
+    g1, g2 = groups
+    results = pd.DataFrame({
+        'metric': np.tile(metrics, n_segments),
+        f'n_{g1}': n1.ravel(),
+        f'n_{g2}': n2.ravel(),
+        f'mean_{g1}': m1.ravel(),
+        f'mean_{g2}': m2.ravel(),
+        'mean_diff': (m1 - m2).ravel(),
+        'welch_t': t_stat.ravel(),
+        'welch_df': dof.ravel(),
+        'welch_p': welch_p.ravel(),
+        'mannwhitney_u': mw_u.ravel(),
+        'mannwhitney_p': mw_p.ravel(),
+    })
+
+    segment_frame = seg_labels.repeat(n_metrics).to_frame(index=False)
+    results = pd.concat([segment_frame, results], axis=1)
+
+    results['welch_p_adj'] = adjust_pvalues(results['welch_p'], correction)
+    results['mannwhitney_p_adj'] = adjust_pvalues(results['mannwhitney_p'], correction)
+    results['welch_significant'] = results['welch_p_adj'] < alpha
+    results['mannwhitney_significant'] = results['mannwhitney_p_adj'] < alpha
+    return results
+
+
+def run_segment_hypothesis_tests():
+    """
+    Runs the verified vs. unconfirmed host comparison for every metric in
+    every borough and room-type segment, and saves the corrected results.
+    """
+    print("--- Batched Hypothesis Tests: Host Verification by Segment ---")
+
+    cleaned_data_path = '../data/processed/cleaned_airbnb_data.csv'
+    output_path = '../reports/segment_hypothesis_tests.csv'
+
+    # --- Load Data ---
+    if not os.path.exists(cleaned_data_path):
+        print(f"Error: Cleaned data file not found at '{cleaned_data_path}'")
+        return
+
+    try:
+        df = load_cleaned_data(cleaned_data_path)
+        print(f"Successfully loaded cleaned data. Shape: {df.shape}")
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+
+    df['neighbourhood_group'] = replace_values(df['neighbourhood_group'], {'brookln': 'Brooklyn'})
+
+    metrics = ['number_of_reviews', 'price', 'service_fee', 'review_rate_number', 'availability_365']
+    segment_cols = ['neighbourhood_group', 'room_type']
+
+    results = batched_segment_tests(df, metrics, segment_cols)
+    print(f"Ran {len(results)} Welch and {len(results)} Mann-Whitney tests "
+          f"(Benjamini-Hochberg corrected, alpha = 0.05).")
+    print("-" * 50)
+
+    significant = results[results['welch_significant'] | results['mannwhitney_significant']]
+    print(f"\n{len(significant)} segment/metric combinations differ significantly:")
+    print(significant[segment_cols + ['metric', 'mean_diff', 'welch_p_adj', 'mannwhitney_p_adj']].round(4))
+
+    results.to_csv(output_path, index=False)
+    print(f"\nFull results saved to '{output_path}'")
+
+    print("\n--- Batched Hypothesis Tests Complete ---")
+
+
+if __name__ == '__main__':
+    run_segment_hypothesis_tests()
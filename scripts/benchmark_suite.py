@@ -0,0 +1,223 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import subprocess
+import tempfile
+
+import matplotlib
+matplotlib.use('Agg')  # figures are only written to disk during benchmarks
+import pandas as pd
+
+from instrumentation import PipelineTracer, SCRIPTS_DIR
+from synthetic_data import BASE_RAW_ROWS, write_synthetic_csv
+from day_2_data_cleaning import clean_dataframe
+from day_3_EDA import run_eda
+from day_7_feature_engineering import build_feature_matrix
+from day_8_stacked_ensemble_model import build_stacked_model
+
+BENCHMARK_DIR = os.path.join(SCRIPTS_DIR, '..', 'reports', 'benchmarks')
+HISTORY_PATH = os.path.join(BENCHMARK_DIR, 'history.jsonl')
+BENCHMARK_STAGES = ['generate', 'clean', 'features', 'train', 'predict', 'figures']
+# Rows held in memory at a time by the streaming stages
+CHUNK_SIZE = 500_000
+# Share of the feature rows available for training; the rest are scored by 'predict'
+TRAIN_FRACTION = 0.8
+# Categorical features one-hot encoded by Day 7
+CATEGORICAL_COLUMNS = ['neighbourhood_group', 'room_type']
+# Intermediate CSVs of large scales need tens of GB; /data/synthetic/ is git-ignored
+WORK_DIR = os.path.join(SCRIPTS_DIR, '..', 'data', 'synthetic', 'benchmark')
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silences the pipeline's progress prints so they do not skew timings."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _stream_csv(path, chunk_size, **read_csv_kwargs):
+    return pd.read_csv(path, chunksize=chunk_size, low_memory=False, **read_csv_kwargs)
+
+
+def _category_vocabulary(path, chunk_size):
+    """
+    Sorted values of each categorical feature over the whole cleaned file,
+    so every chunk is one-hot encoded against the same categories (and
+    drops the same baseline) however its rows happen to be distributed.
+    """
+    values = {col: set() for col in CATEGORICAL_COLUMNS}
+    for chunk in _stream_csv(path, chunk_size, usecols=CATEGORICAL_COLUMNS):
+        for col in CATEGORICAL_COLUMNS:
+            values[col].update(chunk[col].dropna().unique())
+    return {col: pd.CategoricalDtype(sorted(v)) for col, v in values.items()}
+
+
+def run_benchmark(scale, stages=BENCHMARK_STAGES, max_train_rows=None, seed=42, trace_malloc=False,
+                  chunk_size=CHUNK_SIZE, work_dir=WORK_DIR):
+    """
+    Runs the selected pipeline stages on a synthetic dataset `scale` times
+    the size of the raw NYC extract. Returns the tracer, with one stage
+    entry per benchmarked operation, and the number of rows each stage
+    processed.
+
+    Generation, cleaning, feature building and prediction stream
+    `chunk_size` rows at a time through CSV files in `work_dir`, so memory
+    stays bounded at 100x-1000x scales. Training uses at most
+    `max_train_rows` rows out of the first TRAIN_FRACTION of the feature
+    file; prediction scores only the rows after them. The figures stage
+    loads the whole cleaned file, as Day 3 does.
+    """
+    n_rows = int(BASE_RAW_ROWS * scale)
+    run_name = f"bench_{scale:g}x_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    tracer = PipelineTracer(run_name, trace_malloc=trace_malloc)
+    rows = {}
+
+    os.makedirs(work_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        raw_path = os.path.join(tmp_dir, 'raw.csv')
+        cleaned_path = os.path.join(tmp_dir, 'cleaned.csv')
+        features_path = os.path.join(tmp_dir, 'features.csv')
+        target_path = os.path.join(tmp_dir, 'target.csv')
+
+        with tracer.stage('generate'):
+            write_synthetic_csv(raw_path, n_rows, seed=seed, chunk_size=chunk_size, raw=True)
+        rows['generate'] = n_rows
+
+        with tracer.stage('clean'), _quiet():
+            rows['clean'] = 0
+            for i, chunk in enumerate(_stream_csv(raw_path, chunk_size, parse_dates=['last review'])):
+                cleaned = clean_dataframe(chunk)
+                cleaned.to_csv(cleaned_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+                rows['clean'] += len(cleaned)
+
+        if {'features', 'train', 'predict'} & set(stages):
+            with tracer.stage('features'), _quiet():
+                rows['features'] = 0
+                dtypes = _category_vocabulary(cleaned_path, chunk_size)
+                for i, chunk in enumerate(_stream_csv(cleaned_path, chunk_size, parse_dates=['last_review'],
+                                                      dtype=dtypes)):
+                    X, y = build_feature_matrix(chunk)
+                    X.to_csv(features_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+                    y.to_csv(target_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+                    rows['features'] += len(X)
+
+        if {'train', 'predict'} & set(stages):
+            n_train = int(rows['features'] * TRAIN_FRACTION)
+            if max_train_rows is not None:
+                n_train = min(n_train, max_train_rows)
+            X_train = pd.read_csv(features_path, nrows=n_train)
+            y_train = pd.read_csv(target_path, nrows=n_train).iloc[:, 0]
+            with tracer.stage('train'):
+                model = build_stacked_model()
+                model.fit(X_train, y_train)
+            rows['train'] = len(X_train)
+            del X_train, y_train
+
+        if 'predict' in stages:
+            with tracer.stage('predict'):
+                rows['predict'] = 0
+                # Score only rows the model has not seen (line 0 is the header)
+                holdout = _stream_csv(features_path, chunk_size, skiprows=lambda line: 0 < line <= n_train)
+                for chunk in holdout:
+                    model.predict(chunk)
+                    rows['predict'] += len(chunk)
+
+        if 'figures' in stages:
+            with tracer.stage('figures'):
+                tracer.checkpoint('run_eda')
+                with _quiet():
+                    run_eda(cleaned_data_path=cleaned_path, output_dir=os.path.join(tmp_dir, 'figures'))
+            rows['figures'] = rows['clean']
+
+    return tracer, rows
+
+
+def record_history(tracer, scale, rows=None, history_path=HISTORY_PATH):
+    """Appends one JSON line per benchmarked stage to the history file."""
+    os.makedirs(os.path.dirname(history_path), exist_ok=True)
+    commit = _git_commit()
+    timestamp = datetime.datetime.now().isoformat(timespec='seconds')
+    rows = rows or {}
+    records = []
+    for stage in tracer.stages:
+        records.append({
+            'timestamp': timestamp,
+            'commit': commit,
+            'scale': scale,
+            'stage': stage['name'],
+            'rows': rows.get(stage['name']),
+            'seconds': stage['seconds'],
+            'peak_rss_growth_mb': stage['peak_rss_growth_mb'],
+            'process_peak_rss_mb': stage['process_peak_rss_mb'],
+        })
+    with open(history_path, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+    return records
+
+
+def previous_results(scale, history_path=HISTORY_PATH):
+    """Returns the most recent recorded seconds per stage for `scale`."""
+    latest = {}
+    if not os.path.exists(history_path):
+        return latest
+    with open(history_path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record['scale'] == scale:
+                latest[record['stage']] = record
+    return latest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline on synthetic NYC-like data.')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10],
+                        help='Dataset sizes relative to the NYC extract (default: 1 10). Scales of 100 and '
+                             '1000 (~10M-100M rows) stream through disk; combine them with --max-train-rows '
+                             "and leave out 'figures', which loads the whole cleaned file.")
+    parser.add_argument('--stages', nargs='+', default=BENCHMARK_STAGES, choices=BENCHMARK_STAGES,
+                        help="Stages to time; 'generate' and 'clean' always run.")
+    parser.add_argument('--max-train-rows', type=int, default=None,
+                        help='Train on at most this many rows (recommended at 100x and above). Training '
+                             f'never uses more than {TRAIN_FRACTION * 100:.0f}%% of the rows; the rest are scored.')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows per streamed chunk.')
+    parser.add_argument('--work-dir', default=WORK_DIR, help='Directory for the intermediate CSV files.')
+    parser.add_argument('--tracemalloc', action='store_true', help='Also record Python heap peaks.')
+    args = parser.parse_args()
+
+    print("--- Pipeline Benchmark Suite ---")
+    for scale in args.scales:
+        print(f"\n[Scale {scale:g}x] {int(BASE_RAW_ROWS * scale):,} raw listings")
+        baseline = previous_results(scale)
+        tracer, rows = run_benchmark(scale, args.stages, args.max_train_rows, trace_malloc=args.tracemalloc,
+                                     chunk_size=args.chunk_size, work_dir=args.work_dir)
+        trace_path = tracer.save(os.path.join(BENCHMARK_DIR, 'traces'))
+        records = record_history(tracer, scale, rows)
+
+        for record in records:
+            line = f"  {record['stage']:<10} {record['seconds']:>10.3f} s   peak RSS +{record['peak_rss_growth_mb']} MB"
+            previous = baseline.get(record['stage'])
+            if previous and previous['seconds']:
+                change = (record['seconds'] - previous['seconds']) / previous['seconds']
+                line += f"   ({change:+.1%} vs {previous['commit'] or 'previous run'})"
+            print(line)
+        print(f"  Trace saved to '{trace_path}'")
+
+    print(f"\nResults appended to '{HISTORY_PATH}'")
+    print("\n--- Benchmark Suite Complete ---")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import pandas as pd
+import numpy as np
+import os
+from joblib import Parallel, delayed
+from host_index import HostIndex
+from data_store import load_cleaned_data, replace_values
+
+SUPPORTED_STATS = ('mean', 'median', 'std')
+
+# Upper bound on the size of one (replicates x observations) weight matrix
+MAX_WEIGHT_CELLS = 4_000_000
+
+
+def _weighted_stat(x, weights, stat):
+    """
+    Evaluates `stat` on every bootstrap replicate at once. Each row of
+    `weights` holds the multinomial resampling counts of one replicate, so
+    the resampled data never has to be materialized. `x` must be sorted.
+    """
+    n = len(x)
+    if stat == 'mean':
+        return weights @ x / n
+    if stat == 'std':
+        # Centre on the sample mean first to avoid catastrophic cancellation
+        centred = x - x.mean()
+        rep_mean = weights @ centred / n
+        return np.sqrt((weights @ centred ** 2 - n * rep_mean ** 2) / (n - 1))
+    if stat == 'median':
+        cumulative = np.cumsum(weights, axis=1)
+        lower = np.argmax(cumulative > (n - 1) // 2, axis=1)
+        upper = np.argmax(cumulative > n // 2, axis=1)
+        return (x[lower] + x[upper]) / 2.0
+    raise ValueError(f"Unsupported statistic '{stat}'. Choose from {SUPPORTED_STATS}.")
+
+
+def _bootstrap_block(group_values, stat, n_reps, seed_seq):
+    """Computes `n_reps` bootstrap replicates of `stat` for every group."""
+    rng = np.random.default_rng(seed_seq)
+    replicates = np.empty((len(group_values), n_reps))
+    for g, x in enumerate(group_values):
+        n = len(x)
+        probs = np.full(n, 1.0 / n)
+        # Draw weights in sub-batches so large groups keep memory bounded
+        batch = max(1, min(n_reps, MAX_WEIGHT_CELLS // n))
+        for start in range(0, n_reps, batch):
+            stop = min(start + batch, n_reps)
+            weights = rng.multinomial(n, probs, size=stop - start).astype(np.float64)
+            replicates[g, start:stop] = _weighted_stat(x, weights, stat)
+    return replicates
+
+
+def bootstrap_grouped_ci(df, group_col, value_col, stat='mean', n_boot=1000, confidence=0.95,
+                         seed=42, n_jobs=-1, block_size=50):
+    """
+    Computes percentile bootstrap confidence intervals for a grouped statistic.
+
+    Replicates are split into fixed-size blocks, each with its own child seed
+    spawned from `seed`, and the blocks are spread across worker processes.
+    Results are therefore identical for any `n_jobs`. For 'std', groups with
+    fewer than two observations get NaN bounds.
+    """
+    if stat not in SUPPORTED_STATS:
+        raise ValueError(f"Unsupported statistic '{stat}'. Choose from {SUPPORTED_STATS}.")
+
+    data = df[[group_col, value_col]].dropna()
+    grouped = data.groupby(group_col, sort=True, observed=True)[value_col]
+    labels = list(grouped.groups.keys())
+    group_values = [np.sort(grouped.get_group(label).to_numpy(dtype=np.float64)) for label in labels]
+
+    block_sizes = [block_size] * (n_boot // block_size)
+    if n_boot % block_size:
+        block_sizes.append(n_boot % block_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(block_sizes))
+
+    # The sample std needs two observations; mask smaller groups instead of dividing by zero
+    sizes = np.array([len(x) for x in group_values])
+    valid = sizes >= 2 if stat == 'std' else sizes >= 1
+    blocks = Parallel(n_jobs=n_jobs)(
+        delayed(_bootstrap_block)([x for x, ok in zip(group_values, valid) if ok], stat, reps, seed_seq)
+        for reps, seed_seq in zip(block_sizes, seeds)
+    )
+    replicates = np.concatenate(blocks, axis=1)
+
+    tail = (1 - confidence) / 2 * 100
+    lower = np.full(len(group_values), np.nan)
+    upper = np.full(len(group_values), np.nan)
+    if valid.any():
+        lower[valid], upper[valid] = np.percentile(replicates, [tail, 100 - tail], axis=1)
+    estimates = [getattr(pd.Series(x), stat)() for x in group_values]
+
+    return pd.DataFrame({
+        'n': sizes,
+        stat: estimates,
+        'ci_lower': lower,
+        'ci_upper': upper,
+    }, index=pd.Index(labels, name=group_col))
+
+
+def run_bootstrap_report():
+    """
+    Reports bootstrap confidence intervals for the Day 4 borough and
+    neighbourhood price statistics and the Day 6 power-host comparison.
+    """
+    print("--- Bootstrap Confidence Intervals for Pricing Insights ---")
+
+    cleaned_data_path = '../data/processed/cleaned_airbnb_data.csv'
+    n_boot = 1000
+
+    # --- Load Data ---
+    if not os.path.exists(cleaned_data_path):
+        print(f"Error: Cleaned data file not found at '{cleaned_data_path}'")
+        return
+
+    try:
+        df = load_cleaned_data(cleaned_data_path)
+        print(f"Successfully loaded cleaned data. Shape: {df.shape}")
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+
+    df['neighbourhood_group'] = replace_values(df['neighbourhood_group'], {'brookln': 'Brooklyn'})
+
+    # --- Task 1: Borough Price Statistics ---
+    print(f"\n[Task 1/3] Borough price statistics ({n_boot} replicates, 95% CI)...")
+    for stat in ['mean', 'median']:
+        print(f"\nPrice {stat.title()} by Borough:")
+        print(bootstrap_grouped_ci(df, 'neighbourhood_group', 'price', stat=stat, n_boot=n_boot).round(2))
+    print("-" * 50)
+
+    # --- Task 2: Premium Neighbourhoods ---
+    print("\n[Task 2/3] Average price of the Top 10 premium neighbourhoods...")
+    top_10 = df.groupby('neighbourhood', observed=True)['price'].mean().sort_values(ascending=False).head(10).index
+    top_ci = bootstrap_grouped_ci(df[df['neighbourhood'].isin(top_10)], 'neighbourhood', 'price',
+                                  n_boot=n_boot)
+    print(top_ci.sort_values('mean', ascending=False).round(2))
+    print("-" * 50)
+
+    # --- Task 3: Power Hosts vs. Other Hosts ---
+    print("\n[Task 3/3] Power hosts (Top 10 by listing count) vs. all other hosts...")
+    host_index = HostIndex(df)
+    power_rows = host_index.listing_rows(host_index.top_k(10).index)
+    df['host_segment'] = 'Other Hosts'
+    df.iloc[power_rows, df.columns.get_loc('host_segment')] = 'Power Hosts'
+
+    comparison_cols = ['price', 'service_fee', 'number_of_reviews', 'review_rate_number', 'availability_365']
+    for col in comparison_cols:
+        print(f"\nMean '{col}':")
+        print(bootstrap_grouped_ci(df, 'host_segment', col, n_boot=n_boot).round(2))
+
+    print("\n--- Bootstrap Report Complete ---")
+
+
+if __name__ == '__main__':
+    run_bootstrap_report()
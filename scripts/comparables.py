@@ -0,0 +1,233 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from data_store import load_cleaned_data
+from day_7_feature_engineering import build_feature_matrix
+
+CLEANED_DATA_PATH = '../data/processed/cleaned_airbnb_data.csv'
+FEATURES_PATH = '../data/processed/model_features.csv'
+INDEX_PATH = '../models/comparables_index.npz'
+
+# Listing details returned with every comparable
+LISTING_COLUMNS = ['id', 'neighbourhood_group', 'neighbourhood', 'room_type', 'price']
+GEO_COLUMNS = ['lat', 'long']
+
+
+class ComparablesIndex:
+    """
+    Approximate nearest-neighbour index over the encoded listing features
+    plus latitude/longitude (IVF: inverted file).
+
+    Every dimension is standardized (geo dimensions are additionally
+    up-weighted by `geo_weight`), listings are partitioned into
+    `n_lists` clusters by a k-means coarse quantizer, and each cluster's
+    members are stored contiguously in a CSR layout:
+    `order[offsets[c]:offsets[c + 1]]` are the listings of cluster c. A query
+    is compared against the centroids first and only the listings of its
+    `n_probe` closest clusters are scored exactly.
+    """
+
+    def __init__(self, vectors, centroids, order, offsets, mean, scale, columns, listings):
+        self.vectors = vectors
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+        self.mean = mean
+        self.scale = scale
+        self.columns = list(columns)
+        self.listings = listings.reset_index(drop=True)
+
+    @classmethod
+    def build(cls, features, listings, n_lists=None, geo_weight=2.0, seed=42):
+        """
+        Builds the index from encoded features (including 'lat'/'long') and
+        the listing details aligned with them row by row.
+        """
+        columns = list(features.columns)
+        values = features.to_numpy(dtype=np.float64)
+        mean = values.mean(axis=0)
+        scale = values.std(axis=0)
+        scale[scale == 0] = 1.0
+        geo = [columns.index(c) for c in GEO_COLUMNS if c in columns]
+        scale[geo] /= geo_weight
+        vectors = ((values - mean) / scale).astype(np.float32)
+
+        # ~sqrt(n) lists keeps both the centroid scan and the probed lists small
+        n_lists = n_lists or max(1, int(np.sqrt(len(vectors))))
+        quantizer = MiniBatchKMeans(n_clusters=n_lists, random_state=seed, batch_size=4096, n_init=3)
+        labels = quantizer.fit_predict(vectors)
+
+        order = np.argsort(labels, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))]).astype(np.int64)
+        return cls(vectors, quantizer.cluster_centers_.astype(np.float32), order, offsets, mean, scale,
+                   columns, listings[LISTING_COLUMNS])
+
+    def encode(self, features):
+        """Aligns raw query features to the index columns and standardizes them."""
+        values = features.reindex(columns=self.columns, fill_value=0).to_numpy(dtype=np.float64)
+        return ((values - self.mean) / self.scale).astype(np.float32)
+
+    @staticmethod
+    def _squared_distances(queries, points):
+        # |q - p|^2 = |q|^2 - 2 q.p + |p|^2, one matrix product per batch
+        return ((queries ** 2).sum(axis=1)[:, None] - 2 * queries @ points.T
+                + (points ** 2).sum(axis=1)[None, :]).clip(min=0)
+
+    def search(self, features, k=10, n_probe=8, exclude_rows=None):
+        """
+        Returns the k most similar listings for every query row as a long
+        DataFrame ('query', 'rank', listing details, 'distance').
+        `exclude_rows` gives, per query, the index row of a listing to leave
+        out of its results (the query listing itself; -1 for none).
+        """
+        queries = self.encode(features)
+        if exclude_rows is not None:
+            exclude_rows = np.asarray(exclude_rows, dtype=np.int64)
+        n_probe = min(n_probe, len(self.centroids))
+        centroid_dist = self._squared_distances(queries, self.centroids)
+        probes = np.argpartition(centroid_dist, n_probe - 1, axis=1)[:, :n_probe]
+
+        results = []
+        for q, lists in enumerate(probes):
+            candidates = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in lists])
+            if exclude_rows is not None:
+                # Excluded by identity: float32 distances to the listing itself are not exactly zero
+                candidates = candidates[candidates != exclude_rows[q]]
+            if not len(candidates):
+                continue
+            dist = self._squared_distances(queries[q:q + 1], self.vectors[candidates])[0]
+            top_n = min(k, len(candidates))
+            top = np.argpartition(dist, top_n - 1)[:top_n]
+            top = top[np.argsort(dist[top], kind='stable')]
+            rows = candidates[top]
+            results.append(pd.DataFrame({
+                'query': q,
+                'rank': np.arange(1, len(rows) + 1),
+                **{col: self.listings[col].to_numpy()[rows] for col in LISTING_COLUMNS},
+                'distance': np.sqrt(dist[top]),
+            }))
+        if not results:
+            return pd.DataFrame(columns=['query', 'rank'] + LISTING_COLUMNS + ['distance'])
+        return pd.concat(results, ignore_index=True)
+
+    def price_suggestion(self, features, k=10, n_probe=8):
+        """Median, 25th and 75th percentile price of each query's k comparables."""
+        neighbours = self.search(features, k=k, n_probe=n_probe)
+        summary = neighbours.groupby('query')['price'].describe(percentiles=[0.25, 0.5, 0.75])
+        return summary[['count', '25%', '50%', '75%']].rename(columns={'50%': 'median'})
+
+    def save(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Text details are stored as fixed-width unicode so the file loads without pickle
+        listings = {f'listing_{col}': self.listings[col].to_numpy(dtype=np.float64 if col == 'price' else str)
+                    for col in LISTING_COLUMNS if col != 'id'}
+        np.savez(path, vectors=self.vectors, centroids=self.centroids, order=self.order,
+                 offsets=self.offsets, mean=self.mean, scale=self.scale, columns=np.array(self.columns),
+                 listing_id=self.listings['id'].to_numpy(dtype=np.int64), **listings)
+        return path
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        data = np.load(path)
+        listings = pd.DataFrame({col: data[f'listing_{col}'] for col in LISTING_COLUMNS})
+        return cls(data['vectors'], data['centroids'], data['order'], data['offsets'], data['mean'],
+                   data['scale'], data['columns'].tolist(), listings)
+
+
+def load_index_inputs(cleaned_data_path=CLEANED_DATA_PATH, features_path=FEATURES_PATH):
+    """
+    Rebuilds the Day 7 encoding from the cleaned data (so rows stay aligned
+    with their ids, prices and coordinates), restricted to the columns of
+    model_features.csv, and appends lat/long.
+    """
+    df = load_cleaned_data(cleaned_data_path, parse_dates=['last_review'])
+    # build_feature_matrix reports every step; the index only needs its output
+    with contextlib.redirect_stdout(io.StringIO()):
+        X, _ = build_feature_matrix(df)
+    model_columns = pd.read_csv(features_path, nrows=0).columns
+    features = X.reindex(columns=model_columns, fill_value=0)
+    features[GEO_COLUMNS] = df[GEO_COLUMNS].to_numpy(dtype=np.float64)
+
+    complete = features.notna().all(axis=1).to_numpy() & df['price'].notna().to_numpy()
+    return features[complete], df.loc[complete, LISTING_COLUMNS]
+
+
+def build_comparables_index(index_path=INDEX_PATH, n_lists=None):
+    """Builds, evaluates and saves the comparables index."""
+    print("--- Building Comparable-Listings Index ---")
+
+    if not all(os.path.exists(p) for p in [CLEANED_DATA_PATH, FEATURES_PATH]):
+        print("Error: Required data files not found. Please run the Day 2 and Day 7 scripts first.")
+        return
+
+    try:
+        features, listings = load_index_inputs()
+        print(f"Loaded {len(features)} encoded listings with {features.shape[1]} dimensions.")
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+
+    start = time.perf_counter()
+    index = ComparablesIndex.build(features, listings, n_lists=n_lists)
+    print(f"Index built with {len(index.centroids)} lists in {time.perf_counter() - start:.2f}s.")
+
+    # Recall against exact search and query latency on a sample of listings
+    sample = features.sample(n=min(200, len(features)), random_state=42)
+    start = time.perf_counter()
+    approx = index.search(sample, k=10)
+    batch_ms = (time.perf_counter() - start) * 1000
+    exact_dist = index._squared_distances(index.encode(sample), index.vectors)
+    exact = np.argsort(exact_dist, axis=1)[:, :10]
+    exact_ids = index.listings['id'].to_numpy()[exact]
+    recall = np.mean([np.isin(approx.loc[approx['query'] == q, 'id'], exact_ids[q]).mean()
+                      for q in range(len(sample))])
+    print(f"Recall@10 vs exact search: {recall:.1%}; "
+          f"{batch_ms:.1f} ms for {len(sample)} queries ({batch_ms / len(sample):.2f} ms/query).")
+
+    path = index.save(index_path)
+    print(f"Index saved to '{path}'")
+    print("\n--- Comparable-Listings Index Complete ---")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Nearest comparable listings for price suggestions.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Build and save the index.')
+    build_parser.add_argument('--lists', type=int, default=None, help='Number of IVF lists (default ~sqrt(n)).')
+
+    query_parser = subparsers.add_parser('query', help='Find comparables of existing listings by id.')
+    query_parser.add_argument('ids', nargs='+', type=int)
+    query_parser.add_argument('-k', type=int, default=10)
+    query_parser.add_argument('--probe', type=int, default=8, help='IVF lists scanned per query.')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_comparables_index(n_lists=args.lists)
+        return
+
+    if not os.path.exists(INDEX_PATH):
+        print(f"Error: Index not found at '{INDEX_PATH}'. Run 'build' first.")
+        return
+    index = ComparablesIndex.load(INDEX_PATH)
+    positions = np.flatnonzero(np.isin(index.listings['id'].to_numpy(), args.ids))
+    if not len(positions):
+        print("None of the given ids are in the index.")
+        return
+    # The stored vectors are already standardized; undo that to query with raw features
+    raw = pd.DataFrame(index.vectors[positions].astype(np.float64) * index.scale + index.mean, columns=index.columns)
+    start = time.perf_counter()
+    result = index.search(raw, k=args.k, n_probe=args.probe, exclude_rows=positions)
+    print(f"Found comparables in {(time.perf_counter() - start) * 1000:.1f} ms.")
+    result['query'] = index.listings['id'].to_numpy()[positions][result['query']]
+    print(result.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+import importlib.util
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+CLEANED_DATA_PATH = '../data/processed/cleaned_airbnb_data.csv'
+DICTIONARY_PATH = '../data/processed/string_dictionary.json'
+DATASET_PATH = '../data/processed/cleaned_airbnb_dataset'
+
+# Hive partition keys of the processed dataset: borough, then year of 'last_review'
+PARTITION_COLS = ['neighbourhood_group', 'review_year']
+
+# Low/medium-cardinality text columns, stored as dictionary-encoded categoricals
+# whose categories come from a dictionary shared across runs
+DICTIONARY_COLUMNS = ['host_name', 'host_identity_verified', 'neighbourhood_group', 'neighbourhood',
+                      'cancellation_policy', 'room_type']
+# High-cardinality free text, stored as Arrow-backed strings
+ARROW_COLUMNS = ['name']
+
+
+def _arrow_string_dtype():
+    """Arrow-backed string dtype, or None when pyarrow is not installed."""
+    if importlib.util.find_spec('pyarrow') is None:
+        return None
+    return pd.StringDtype('pyarrow')
+
+
+def _to_category(series):
+    """Dictionary-encodes a text column; non-string values are cast to str first."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.where(series.isna(), series.astype(str)).astype('category')
+
+
+def _apply_dictionary(series, categories):
+    """
+    Converts `series` to a categorical whose categories follow the shared
+    dictionary order; values missing from the dictionary are appended.
+    """
+    series = _to_category(series)
+    known = set(categories)
+    extra = sorted(str(c) for c in series.cat.categories if c not in known)
+    return series.cat.set_categories(list(categories) + extra)
+
+
+def compact_text_columns(df, dictionary=None):
+    """
+    Converts the text columns of `df` to compact storage: dictionary-encoded
+    categoricals for DICTIONARY_COLUMNS and Arrow-backed strings for
+    ARROW_COLUMNS. Columns that are absent are skipped.
+    """
+    dictionary = dictionary or {}
+    for col in DICTIONARY_COLUMNS:
+        if col in df.columns:
+            if col in dictionary:
+                df[col] = _apply_dictionary(df[col], dictionary[col])
+            else:
+                df[col] = _to_category(df[col])
+
+    arrow_dtype = _arrow_string_dtype()
+    if arrow_dtype is not None:
+        for col in ARROW_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype(arrow_dtype)
+    return df
+
+
+def build_string_dictionary(df):
+    """Returns {column: categories} for the dictionary-encoded columns of `df`."""
+    return {
+        col: [str(c) for c in df[col].cat.remove_unused_categories().cat.categories]
+        for col in DICTIONARY_COLUMNS
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+
+
+def save_string_dictionary(dictionary, path=DICTIONARY_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(dictionary, f, indent=1)
+    return path
+
+
+def load_string_dictionary(path=DICTIONARY_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def text_memory_report(before, after, columns=None):
+    """
+    Compares the deep memory usage of the text columns of two frames (for
+    example object dtype vs. compact storage). Returns a DataFrame in MB.
+    """
+    columns = columns or [c for c in DICTIONARY_COLUMNS + ARROW_COLUMNS if c in after.columns]
+    report = pd.DataFrame({
+        'before_mb': before[columns].memory_usage(index=False, deep=True) / 1024 ** 2,
+        'after_mb': after[columns].memory_usage(index=False, deep=True) / 1024 ** 2,
+    })
+    report.loc['total'] = report.sum()
+    report['saved_mb'] = report['before_mb'] - report['after_mb']
+    report['saved_pct'] = report['saved_mb'] / report['before_mb'] * 100
+    return report.round(2)
+
+
+def replace_values(series, mapping):
+    """
+    Series.replace that also works on dictionary-encoded columns: the
+    replacement is applied to the categories and the codes are remapped, so
+    merging two categories (e.g. 'brookln' -> 'Brooklyn') never touches the
+    individual rows' strings.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.replace(mapping)
+    new_labels = series.cat.categories.to_series().replace(mapping)
+    categories = pd.Index(sorted(new_labels.unique()))
+    code_map = categories.get_indexer(new_labels)
+    codes = series.cat.codes.to_numpy()
+    new_codes = np.where(codes >= 0, code_map[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories), index=series.index, name=series.name)
+
+
+def partition_filters(boroughs=None, years=None):
+    """
+    Builds Parquet filters on the partition keys. `boroughs` is a list of
+    borough names; `years` is a list of years or a (first, last) range tuple.
+    Returns None when nothing is filtered.
+    """
+    filters = []
+    if boroughs:
+        filters.append(('neighbourhood_group', 'in', list(boroughs)))
+    if years is not None:
+        if isinstance(years, tuple):
+            filters.extend([('review_year', '>=', int(years[0])), ('review_year', '<=', int(years[1]))])
+        else:
+            filters.append(('review_year', 'in', [int(y) for y in years]))
+    return filters or None
+
+
+def _apply_filters(df, filters):
+    """Applies Parquet-style filters to an in-memory frame."""
+    mask = np.ones(len(df), dtype=bool)
+    for col, op, value in filters:
+        if col == 'review_year' and col not in df.columns:
+            series = pd.to_datetime(df['last_review']).dt.year
+        else:
+            series = df[col]
+        if op == 'in':
+            mask &= series.isin(value).to_numpy()
+        elif op == '==':
+            mask &= (series == value).to_numpy()
+        elif op == '>=':
+            mask &= (series >= value).to_numpy()
+        elif op == '<=':
+            mask &= (series <= value).to_numpy()
+        else:
+            raise ValueError(f"Unsupported filter operator '{op}'.")
+    return df[mask]
+
+
+def write_partitioned_dataset(df, root=DATASET_PATH):
+    """
+    Writes the cleaned listings as a Hive-partitioned Parquet dataset
+    ('neighbourhood_group=<borough>/review_year=<year>/'). The dataset is
+    built next to `root` and swapped in, so readers never see a mix of
+    old and new partitions.
+    """
+    data = df.copy()
+    data['review_year'] = pd.to_datetime(data['last_review']).dt.year.astype(np.int64)
+    staging = root.rstrip('/\\') + '.staging'
+    shutil.rmtree(staging, ignore_errors=True)
+    data.to_parquet(staging, partition_cols=PARTITION_COLS, index=False)
+    shutil.rmtree(root, ignore_errors=True)
+    os.replace(staging, root)
+    return root
+
+
+def load_cleaned_data(path=CLEANED_DATA_PATH, dictionary_path=None, filters=None,
+                      dataset_path=None, **read_csv_kwargs):
+    """
+    Loads the cleaned dataset with text columns in compact storage. The
+    dictionary-encoded columns are parsed straight into categoricals and
+    aligned with the shared dictionary saved by Day 2.
+
+    With `filters` (see `partition_filters`), the Hive-partitioned dataset
+    is read instead of the flat CSV so only the matching partitions are
+    touched. Without the dataset, the CSV is read and filtered in memory.
+    Either way the result has the CSV's columns, in the CSV's order.
+
+    The dictionary and the partitioned dataset default to the ones Day 2
+    writes next to `path`, so another cleaned file (e.g. synthetic data) is
+    never decoded with this dataset's dictionary.
+    """
+    data_dir = os.path.dirname(path)
+    if dictionary_path is None:
+        dictionary_path = os.path.join(data_dir, os.path.basename(DICTIONARY_PATH))
+    if dataset_path is None:
+        dataset_path = os.path.join(data_dir, os.path.basename(DATASET_PATH))
+
+    if filters and os.path.isdir(dataset_path):
+        df = pd.read_parquet(dataset_path, filters=filters)
+        # Return the CSV's schema: drop the derived partition key and undo the
+        # move of the partition columns to the end
+        if os.path.exists(path):
+            columns = list(pd.read_csv(path, nrows=0).columns)
+        else:
+            columns = [col for col in df.columns if col != 'review_year']
+        return compact_text_columns(df[columns], load_string_dictionary(dictionary_path))
+
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: 'category' for col in DICTIONARY_COLUMNS if col in header}
+    arrow_dtype = _arrow_string_dtype()
+    if arrow_dtype is not None:
+        dtypes.update({col: arrow_dtype for col in ARROW_COLUMNS if col in header})
+    dtypes.update(read_csv_kwargs.pop('dtype', {}))
+    df = pd.read_csv(path, dtype=dtypes, **read_csv_kwargs)
+    if filters:
+        df = _apply_filters(df, filters)
+    return compact_text_columns(df, load_string_dictionary(dictionary_path))
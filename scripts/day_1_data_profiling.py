@@ -1,5 +1,8 @@
 import pandas as pd
 import numpy as np
+import json
+import os
+from fast_profiling import PROFILES_DIR, iter_chunks, profile_chunks, save_profile, diff_profiles
 
 # --- Day 1: Saturday, September 28 - Environment Setup & Data Profiling ---
 
@@ -19,49 +22,84 @@ print("Libraries (pandas, numpy, matplotlib, seaborn) are installed in the Conda
 
 
 # --- Task 2: Load Data ---
-# Loading the dataset into a pandas DataFrame.
-# NOTE: Assuming the dataset is in the same directory and named 'NYC_Airbnb.csv'.
+# Streaming the dataset in chunks instead of loading it into one DataFrame.
+# The Excel file is read row by row (openpyxl, read-only mode) and profiled in a single
+# pass, so neither the full frame nor a deep per-string memory walk is needed.
+RAW_DATA_PATH = r'C:\Users\jaiku\PycharmProjects\Airbnb_Analysis\data\raw\1730285881-Airbnb_Open_Data.xlsx'
+PROFILE_PATH = os.path.join(PROFILES_DIR, 'day_1_raw_data.profile.json')
+
 try:
-    df = pd.read_excel(r'C:\Users\jaiku\PycharmProjects\Airbnb_Analysis\data\raw\1730285881-Airbnb_Open_Data.xlsx')
-    print("--- Task 2: Load Data Complete ---")
-    print("Dataset 'NYC_Airbnb.xlsx' loaded successfully.\n")
+    # Keeping the first and last rows of the stream for the head/tail inspection below
+    edges = {}
+
+    def tracked_chunks(path):
+        for chunk in iter_chunks(path):
+            edges.setdefault('head', chunk.head())
+            edges['tail'] = chunk.tail()
+            yield chunk
 
-    print("--- Initial Memory Usage ---")
-    # Checking the initial memory usage to understand the dataset's footprint.
-    df.info(memory_usage='deep')
-    print("\n")
+    profile = profile_chunks(tracked_chunks(RAW_DATA_PATH), source=os.path.abspath(RAW_DATA_PATH))
+    columns = profile['columns']
+    print("--- Task 2: Load Data Complete ---")
+    print("Dataset 'NYC_Airbnb.xlsx' streamed and profiled successfully.\n")
 
 
     # --- Task 3: Initial Data Profiling ---
     print("--- Task 3: Initial Data Profiling ---")
 
-    # Using df.info() to check column names, non-null counts, and data types.
+    # Listing column names, non-null counts, inferred kinds and approximate cardinality.
     # This helps identify columns that might need data type conversion (e.g., last_review)
     # and gives a first look at missing data.
-    print("\n[Profiling Step 1: DataFrame Info]")
-    df.info()
-
-    # Using df.shape to understand the scale of the data.
+    print("\n[Profiling Step 1: Column Overview]")
+    overview = pd.DataFrame({
+        'kind': [stats['kind'] for stats in columns.values()],
+        'non_null': [stats['count'] - stats['null_count'] for stats in columns.values()],
+        'distinct_estimate': [stats['distinct_estimate'] for stats in columns.values()],
+    }, index=list(columns))
+    print(overview)
+
+    # Checking the number of rows and columns to understand the scale of the data.
     print("\n\n[Profiling Step 2: Dataset Shape]")
-    print(f"The dataset contains {df.shape[0]} rows and {df.shape[1]} columns.")
+    print(f"The dataset contains {profile['rows']} rows and {len(columns)} columns.")
 
-    # Using df.head() and df.tail() to visually inspect the first and last few rows.
+    # Showing the first and last few rows of the stream.
     # This is a quick check to ensure the data has loaded correctly and to see the format.
     print("\n\n[Profiling Step 3: First 5 Rows (head)]")
-    print(df.head())
+    print(edges.get('head'))
 
     print("\n\n[Profiling Step 4: Last 5 Rows (tail)]")
-    print(df.tail())
+    print(edges.get('tail'))
 
-    # Generating descriptive statistics for numerical columns with df.describe().
+    # Summary statistics for numerical columns from the streaming profile.
     # This is crucial for spotting potential outliers or illogical values (e.g., price=0).
     print("\n\n[Profiling Step 5: Descriptive Statistics for Numerical Columns]")
-    print(df.describe())
-
-    # Using df.isnull().sum() to get a precise count of missing values for each column.
+    numeric = {col: stats for col, stats in columns.items() if stats['kind'] == 'numeric'}
+    print(pd.DataFrame({
+        'count': [stats['count'] - stats['null_count'] for stats in numeric.values()],
+        'mean': [stats.get('mean') for stats in numeric.values()],
+        'min': [stats['min'] for stats in numeric.values()],
+        'max': [stats['max'] for stats in numeric.values()],
+    }, index=list(numeric)))
+
+    # Getting a precise count of missing values for each column.
     # This output directly informs the data cleaning strategy for Day 2.
     print("\n\n[Profiling Step 6: Count of Missing Values per Column]")
-    print(df.isnull().sum())
+    print(pd.Series({col: stats['null_count'] for col, stats in columns.items()}))
+
+    # Saving the profile and comparing it with the previous run, so a new data drop
+    # shows which columns changed before the Day 2 cleaning runs on it.
+    print("\n\n[Profiling Step 7: Column Profile vs. Previous Run]")
+    previous = None
+    if os.path.exists(PROFILE_PATH):
+        with open(PROFILE_PATH) as f:
+            previous = json.load(f)
+    save_profile(profile, PROFILE_PATH)
+    print(f"Profile of {len(columns)} columns saved to '{PROFILE_PATH}'")
+    if previous is None:
+        print("No previous profile found; this run is the baseline.")
+    else:
+        changes = diff_profiles(previous, profile)
+        print('\n'.join(f"  {c}" for c in changes) if changes else "  No significant changes.")
     print("\n--- End of Day 1 Script ---")
 
 
@@ -1,39 +1,42 @@
 import pandas as pd
 import os
+from instrumentation import checkpoint, track_frame
+from data_store import (DICTIONARY_COLUMNS, ARROW_COLUMNS, compact_text_columns, text_memory_report,
+                        build_string_dictionary, save_string_dictionary, replace_values,
+                        write_partitioned_dataset)
 
 # --- Configuration ---
 RAW_DATA_PATH = os.path.join('data', 'raw', r'C:\Users\jaiku\PycharmProjects\Airbnb_Analysis\data\raw\1730285881-Airbnb_Open_Data.xlsx')
 PROCESSED_DATA_PATH = os.path.join('data', 'processed')
 CLEANED_FILE_NAME = 'cleaned_airbnb_data.csv'
+DICTIONARY_FILE_NAME = 'string_dictionary.json'
+DATASET_DIR_NAME = 'cleaned_airbnb_dataset'
 
 
-# --- Main Cleaning Function ---
-def clean_airbnb_data():
+def clean_dataframe(df):
     """
-    Loads the raw Airbnb dataset, performs a comprehensive cleaning process,
-    and saves the cleaned data to a new file.
+    Applies cleaning steps 1-4 (column names, unnecessary columns, missing
+    values and invalid data) to a raw listings DataFrame and returns it.
     """
-    print("--- Starting Day 2: Data Cleaning Process ---")
-
-    # Load the raw data
-    try:
-        df = pd.read_excel(RAW_DATA_PATH)
-        print(f"Successfully loaded raw data from '{RAW_DATA_PATH}'.")
-        print(f"Initial shape of the dataset: {df.shape}")
-    except FileNotFoundError:
-        print(f"Error: The file was not found at '{RAW_DATA_PATH}'.")
-        print("Please ensure the raw data is in the 'data/raw' directory.")
-        return
-
     # --- Step 1: Standardize Column Names ---
     print("\n[Step 1/5] Standardizing column names...")
+    checkpoint('Step 1: Standardizing column names', df)
     original_columns = df.columns.tolist()
     df.columns = [col.strip().lower().replace(' ', '_') for col in df.columns]
     print("Column names standardized to lowercase with underscores.")
     # print(f"New columns: {df.columns.tolist()}")
 
+    # Store text columns compactly before the dropna/filter copies below
+    text_columns = [col for col in DICTIONARY_COLUMNS + ARROW_COLUMNS if col in df.columns]
+    object_text = df[text_columns]
+    df = compact_text_columns(df)
+    print("Text columns converted to dictionary-encoded / Arrow-backed storage.")
+    print(f"Memory of text columns vs. object dtype (MB):\n{text_memory_report(object_text, df, text_columns)}")
+    del object_text
+
     # --- Step 2: Remove Unnecessary Columns ---
     print("\n[Step 2/5] Removing unnecessary columns...")
+    checkpoint('Step 2: Removing unnecessary columns', df)
     columns_to_drop = ['license', 'house_rules', 'country', 'country_code']
     # Check which columns actually exist in the dataframe before trying to drop
     existing_columns_to_drop = [col for col in columns_to_drop if col in df.columns]
@@ -42,6 +45,7 @@ def clean_airbnb_data():
 
     # --- Step 3: Handle Missing Values ---
     print("\n[Step 3/5] Handling missing values...")
+    checkpoint('Step 3: Handling missing values', df)
     # Impute 'reviews_per_month' with 0 where 'number_of_reviews' is 0
     initial_nan_reviews = df['reviews_per_month'].isnull().sum()
     df.loc[df['number_of_reviews'] == 0, 'reviews_per_month'] = df.loc[
@@ -57,6 +61,7 @@ def clean_airbnb_data():
 
     # --- Step 4: Filter Invalid and Illogical Data ---
     print("\n[Step 4/5] Filtering illogical and invalid data...")
+    checkpoint('Step 4: Filtering illogical and invalid data', df)
     rows_before_filter = df.shape[0]
 
     # Filter 'minimum_nights'
@@ -68,13 +73,40 @@ def clean_airbnb_data():
     # Filter 'last_review' for future dates
     df = df[df['last_review'] <= pd.to_datetime('today')]
 
+    # Correct the 'brookln' borough typo so borough partitions are complete
+    df['neighbourhood_group'] = replace_values(df['neighbourhood_group'], {'brookln': 'Brooklyn'})
+
     rows_after_filter = df.shape[0]
     print(f"Removed {rows_before_filter - rows_after_filter} rows with illogical values.")
     print(
         "Ensured 'minimum_nights' >= 1, 'availability_365' is between 0-365, and no future 'last_review' dates exist.")
 
+    return df
+
+
+# --- Main Cleaning Function ---
+def clean_airbnb_data(raw_data_path=RAW_DATA_PATH, processed_data_path=PROCESSED_DATA_PATH):
+    """
+    Loads the raw Airbnb dataset, performs a comprehensive cleaning process,
+    and saves the cleaned data to a new file.
+    """
+    print("--- Starting Day 2: Data Cleaning Process ---")
+
+    # Load the raw data
+    try:
+        df = pd.read_excel(raw_data_path)
+        print(f"Successfully loaded raw data from '{raw_data_path}'.")
+        print(f"Initial shape of the dataset: {df.shape}")
+    except FileNotFoundError:
+        print(f"Error: The file was not found at '{raw_data_path}'.")
+        print("Please ensure the raw data is in the 'data/raw' directory.")
+        return
+
+    df = clean_dataframe(df)
+
     # --- Step 5: Final Verification and Save ---
     print("\n[Step 5/5] Final verification and saving cleaned data...")
+    checkpoint('Step 5: Final verification and saving cleaned data', df)
 
     # Verify no missing values remain
     print(f"\nFinal check for missing values:\n{df.isnull().sum()}")
@@ -84,14 +116,27 @@ def clean_airbnb_data():
         f"\nDescriptive statistics of key cleaned columns:\n{df[['price', 'minimum_nights', 'availability_365']].describe()}")
 
     # Create the processed data directory if it doesn't exist
-    if not os.path.exists(PROCESSED_DATA_PATH):
-        os.makedirs(PROCESSED_DATA_PATH)
-        print(f"Created directory: '{PROCESSED_DATA_PATH}'")
+    if not os.path.exists(processed_data_path):
+        os.makedirs(processed_data_path)
+        print(f"Created directory: '{processed_data_path}'")
 
     # Save the cleaned dataframe
-    final_path = os.path.join(PROCESSED_DATA_PATH, CLEANED_FILE_NAME)
+    track_frame('cleaned_data', df)
+    final_path = os.path.join(processed_data_path, CLEANED_FILE_NAME)
     df.to_csv(final_path, index=False)
 
+    # Persist the shared string dictionary used to reload the text columns compactly
+    dictionary_path = save_string_dictionary(build_string_dictionary(df),
+                                             os.path.join(processed_data_path, DICTIONARY_FILE_NAME))
+    print(f"String dictionary saved to '{dictionary_path}'")
+
+    # Also write a Hive-partitioned copy (borough / review year) for filtered reads
+    try:
+        dataset_path = write_partitioned_dataset(df, os.path.join(processed_data_path, DATASET_DIR_NAME))
+        print(f"Partitioned dataset saved to '{dataset_path}'")
+    except ImportError as e:
+        print(f"Skipped the partitioned dataset (Parquet support unavailable: {e})")
+
     print(f"\n--- Data Cleaning Process Complete ---")
     print(f"Final shape of the cleaned dataset: {df.shape}")
     print(f"Cleaned data has been successfully saved to '{final_path}'")
@@ -1,22 +1,20 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from instrumentation import checkpoint
+from data_store import load_cleaned_data
 
 
-def run_eda():
+def run_eda(cleaned_data_path=r'C:\Users\jaiku\PycharmProjects\Airbnb_Analysis\data\processed\cleaned_airbnb_data.csv',
+            output_dir='../reports/figures'):
     """
     Main function to run the Exploratory Data Analysis for Day 3.
     """
     print("--- Starting Day 3: Initial Exploratory Data Analysis ---")
 
-    # Define file paths
-    cleaned_data_path = r'C:\Users\jaiku\PycharmProjects\Airbnb_Analysis\data\processed\cleaned_airbnb_data.csv'
-    output_dir = '../reports/figures'
-
     # --- Load Data ---
     try:
-        df = pd.read_csv(cleaned_data_path)
+        df = load_cleaned_data(cleaned_data_path)
         print(f"Successfully loaded cleaned data from '{cleaned_data_path}'.")
     except FileNotFoundError:
         print(f"Error: The cleaned data file was not found at '{cleaned_data_path}'.")
@@ -34,6 +32,7 @@ def run_eda():
 
     # --- [Plot 1] Geographic Distribution of Listings ---
     print("\n[Step 1/4] Generating Geographic Distribution Plot...")
+    checkpoint('Step 1: Generating Geographic Distribution Plot', df)
     plt.figure()
     ax = sns.countplot(y=df['neighbourhood_group'], order=df['neighbourhood_group'].value_counts().index,
                        palette='viridis')
@@ -53,6 +52,7 @@ def run_eda():
 
     # --- [Plot 2] Property Type Market Share ---
     print("\n[Step 2/4] Generating Property Type Market Share Plot...")
+    checkpoint('Step 2: Generating Property Type Market Share Plot', df)
     plt.figure()
     room_type_counts = df['room_type'].value_counts()
     colors = sns.color_palette('viridis', len(room_type_counts))
@@ -74,6 +74,7 @@ def run_eda():
 
     # --- [Plot 3] Price Distribution Analysis ---
     print("\n[Step 3/4] Generating Price Distribution Plots...")
+    checkpoint('Step 3: Generating Price Distribution Plots', df)
     # Plotting the full distribution
     plt.figure()
     sns.histplot(df['price'], bins=50, kde=True, color='purple')
@@ -102,6 +103,7 @@ def run_eda():
 
     # --- [Plot 4] Geospatial Visualization of Listings ---
     print("\n[Step 4/4] Generating Geospatial Scatter Plot...")
+    checkpoint('Step 4: Generating Geospatial Scatter Plot', df)
     plt.figure(figsize=(14, 10))
     sns.scatterplot(data=df, x='long', y='lat', hue='neighbourhood_group', palette='viridis', s=10, alpha=0.5)
     plt.title('Geospatial Distribution of NYC Airbnb Listings', fontsize=16, fontweight='bold')
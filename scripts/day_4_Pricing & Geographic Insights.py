@@ -1,13 +1,15 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from instrumentation import checkpoint
+from data_store import load_cleaned_data, replace_values, partition_filters
 
 
-def day_4_analysis_corrected():
+def day_4_analysis_corrected(boroughs=None):
     """
     Performs a deep dive analysis into pricing and geographic insights,
     including a correction for a data typo found during the initial run.
+    Pass `boroughs` to analyse only those borough partitions.
     """
     print("--- Starting Day 4: Deep Dive Analysis (Corrected Version) ---")
 
@@ -22,7 +24,7 @@ def day_4_analysis_corrected():
         return
 
     try:
-        df = pd.read_csv(cleaned_data_path)
+        df = load_cleaned_data(cleaned_data_path, filters=partition_filters(boroughs=boroughs))
         print(f"Successfully loaded cleaned data. Shape: {df.shape}")
     except Exception as e:
         print(f"Error loading data: {e}")
@@ -33,7 +35,7 @@ def day_4_analysis_corrected():
     # This is a critical step to ensure data integrity for this script's operations.
     original_brooklyn_count = df[df['neighbourhood_group'] == 'Brooklyn'].shape[0]
     if 'brookln' in df['neighbourhood_group'].unique():
-        df['neighbourhood_group'] = df['neighbourhood_group'].replace('brookln', 'Brooklyn')
+        df['neighbourhood_group'] = replace_values(df['neighbourhood_group'], {'brookln': 'Brooklyn'})
         corrected_brooklyn_count = df[df['neighbourhood_group'] == 'Brooklyn'].shape[0]
         print(
             f"\nCorrected 'brookln' typo. Merged {corrected_brooklyn_count - original_brooklyn_count} row(s) into 'Brooklyn'.")
@@ -42,9 +44,10 @@ def day_4_analysis_corrected():
 
     # --- Task 1: Multifactorial Price Analysis ---
     print("\n[Task 1/3] Performing Multifactorial Price Analysis...")
+    checkpoint('Task 1: Performing Multifactorial Price Analysis', df)
 
     # Calculate statistics
-    price_stats = df.groupby('neighbourhood_group')['price'].agg(['mean', 'median', 'std']).round(2)
+    price_stats = df.groupby('neighbourhood_group', observed=True)['price'].agg(['mean', 'median', 'std']).round(2)
     print("\nPrice Statistics by Borough (Corrected):")
     print(price_stats)
 
@@ -76,6 +79,7 @@ def day_4_analysis_corrected():
 
     # --- Task 2: Service Fee Correlation Analysis ---
     print("\n[Task 2/3] Analyzing Service Fee Correlation...")
+    checkpoint('Task 2: Analyzing Service Fee Correlation', df)
 
     # Calculate Pearson correlation
     correlation = df['price'].corr(df['service_fee'])
@@ -95,9 +99,10 @@ def day_4_analysis_corrected():
 
     # --- Task 3: Identify Premium Neighborhoods ---
     print("\n[Task 3/3] Identifying Top 10 Premium Neighborhoods...")
+    checkpoint('Task 3: Identifying Top 10 Premium Neighborhoods', df)
 
     # Calculate mean price and get top 10
-    top_10_neighborhoods = df.groupby('neighbourhood')['price'].mean().sort_values(ascending=False).head(10).round(2)
+    top_10_neighborhoods = df.groupby('neighbourhood', observed=True)['price'].mean().sort_values(ascending=False).head(10).round(2)
     print("\nTop 10 Most Expensive Neighborhoods by Average Price:")
     print(top_10_neighborhoods)
 
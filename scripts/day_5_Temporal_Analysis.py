@@ -1,13 +1,16 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from instrumentation import checkpoint
+from data_store import load_cleaned_data, partition_filters
 
 
-def day_5_temporal_analysis():
+def day_5_temporal_analysis(boroughs=None, years=None):
     """
     Performs temporal analysis on the cleaned Airbnb dataset to uncover
     seasonality, long-term trends, and booking patterns.
+    Pass `boroughs` and/or `years` (a list, or a (first, last) tuple) to
+    read only the matching partitions.
     """
     print("--- Starting Day 5: Temporal Analysis & Booking Patterns ---")
 
@@ -22,7 +25,8 @@ def day_5_temporal_analysis():
 
     try:
         # Explicitly parse 'last_review' as a date column on load
-        df = pd.read_csv(cleaned_data_path, parse_dates=['last_review'])
+        df = load_cleaned_data(cleaned_data_path, filters=partition_filters(boroughs, years),
+                               parse_dates=['last_review'])
         print(f"Successfully loaded cleaned data. Shape: {df.shape}")
     except Exception as e:
         print(f"Error loading data: {e}")
@@ -30,12 +34,14 @@ def day_5_temporal_analysis():
 
     # --- Task 1: Seasonality Analysis ---
     print("\n[Task 1/3] Analyzing seasonality based on review dates...")
+    checkpoint('Task 1: Analyzing seasonality based on review dates', df)
 
     # Extract month from last_review
     df['review_month'] = df['last_review'].dt.month
 
     # Count reviews per month
-    monthly_reviews = df['review_month'].value_counts().sort_index()
+    # Reindex so a time slice without reviews in some months still yields all 12 bars
+    monthly_reviews = df['review_month'].value_counts().reindex(range(1, 13), fill_value=0)
     month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
     monthly_reviews.index = month_names
 
@@ -52,6 +58,7 @@ def day_5_temporal_analysis():
 
     # --- Task 2: Long-Term Trend Analysis ---
     print("\n[Task 2/3] Analyzing long-term trends...")
+    checkpoint('Task 2: Analyzing long-term trends', df)
 
     # Extract year from last_review
     df['review_year'] = df['last_review'].dt.year
@@ -77,6 +84,7 @@ def day_5_temporal_analysis():
 
     # --- Task 3: Stay Duration Analysis ---
     print("\n[Task 3/3] Analyzing stay duration via 'minimum_nights'...")
+    checkpoint('Task 3: Analyzing stay duration via minimum_nights', df)
 
     # For a clearer histogram, filter to a reasonable range (e.g., up to 30 nights)
     df_filtered_nights = df[df['minimum_nights'] <= 30]
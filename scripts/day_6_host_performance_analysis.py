@@ -3,12 +3,16 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 from scipy import stats
 import os
+from host_index import HostIndex
+from instrumentation import checkpoint
+from data_store import load_cleaned_data, partition_filters
 
 
-def day_6_host_analysis():
+def day_6_host_analysis(boroughs=None):
     """
     Analyzes host performance, identifies top hosts, and uses a t-test
     to determine the statistical significance of host verification.
+    Pass `boroughs` to analyse only those borough partitions.
     """
     print("--- Starting Day 6: Host Performance & Verification Impact ---")
 
@@ -22,7 +26,7 @@ def day_6_host_analysis():
         return
 
     try:
-        df = pd.read_csv(cleaned_data_path)
+        df = load_cleaned_data(cleaned_data_path, filters=partition_filters(boroughs=boroughs))
         print(f"Successfully loaded cleaned data. Shape: {df.shape}")
     except Exception as e:
         print(f"Error loading data: {e}")
@@ -30,16 +34,20 @@ def day_6_host_analysis():
 
     # --- Task 1: Identify Top Hosts ---
     print("\n[Task 1/3] Identifying Top 10 Hosts by Listing Count...")
-    top_10_hosts = df['host_name'].value_counts().head(10)
+    checkpoint('Task 1: Identifying Top 10 Hosts by Listing Count', df)
+    # Hosts are keyed on 'host_id', since display names collide across different hosts
+    host_index = HostIndex(df)
+    top_10_hosts = host_index.top_k(10)
     print("Top 10 Hosts:")
-    print(top_10_hosts)
+    print(pd.concat([host_index.host_names(top_10_hosts.index), top_10_hosts], axis=1))
     print("-" * 50)
 
     # --- Task 2: Analyze "Power Host" Characteristics ---
     print("\n[Task 2/3] Analyzing 'Power Host' Characteristics...")
+    checkpoint('Task 2: Analyzing Power Host Characteristics', df)
 
     # Create a DataFrame for top hosts' listings
-    top_hosts_df = df[df['host_name'].isin(top_10_hosts.index)]
+    top_hosts_df = host_index.portfolio(top_10_hosts.index)
 
     # Compare descriptive statistics
     print("Comparing Average Stats: Power Hosts vs. General Population")
@@ -67,6 +75,7 @@ def day_6_host_analysis():
 
     # --- Task 3: Statistical Test for Verification Impact ---
     print("\n[Task 3/3] Statistical Test for Host Verification Impact...")
+    checkpoint('Task 3: Statistical Test for Host Verification Impact', df)
 
     # Hypothesis Formulation
     print("Hypothesis Test: Does verification impact the number of reviews?")
@@ -1,42 +1,25 @@
 import pandas as pd
 import numpy as np
 import os
+from instrumentation import checkpoint, track_frame
+from data_store import load_cleaned_data, replace_values
 
 
-def day_7_feature_engineering():
+def build_feature_matrix(df):
     """
-    Prepares and transforms the dataset for machine learning by creating
-    new features, selecting variables, and encoding categorical data.
+    Engineers, selects and one-hot encodes the model features from the
+    cleaned listings. Returns the feature matrix and the log-transformed target.
     """
-    print("--- Starting Day 7: Feature Engineering for Machine Learning ---")
-
-    # Define file paths
-    cleaned_data_path = '../data/processed/cleaned_airbnb_data.csv'
-    processed_dir = '../data/processed/'
-    features_path = os.path.join(processed_dir, 'model_features.csv')
-    target_path = os.path.join(processed_dir, 'model_target.csv')
-
-    # --- Load Data ---
-    if not os.path.exists(cleaned_data_path):
-        print(f"Error: Cleaned data file not found at '{cleaned_data_path}'")
-        return
-
-    try:
-        df = pd.read_csv(cleaned_data_path, parse_dates=['last_review'])
-        print(f"Successfully loaded cleaned data. Shape: {df.shape}")
-    except Exception as e:
-        print(f"Error loading data: {e}")
-        return
-
     # **CRITICAL CORRECTION ADDED**
     # Correct the 'brookln' typo before any feature engineering
-    df['neighbourhood_group'] = df['neighbourhood_group'].replace('brookln', 'Brooklyn')
+    df['neighbourhood_group'] = replace_values(df['neighbourhood_group'], {'brookln': 'Brooklyn'})
     print("\nCorrected 'brookln' typo in neighbourhood_group.")
     print(f"Unique values in neighbourhood_group now: {df['neighbourhood_group'].unique()}")
     print("-" * 50)
 
     # --- Task 1: Create New, Insightful Features ---
     print("\n[Task 1/3] Engineering 'days_since_last_review' feature...")
+    checkpoint('Task 1: Engineering days_since_last_review feature', df)
 
     # Define a fixed recent date for reproducibility
     reference_date = pd.to_datetime('2023-01-01')
@@ -53,6 +36,7 @@ def day_7_feature_engineering():
 
     # --- Task 2: Strategic Feature & Target Selection ---
     print("\n[Task 2/3] Selecting features (X) and target (y)...")
+    checkpoint('Task 2: Selecting features (X) and target (y)', df)
 
     # Define the list of features for the model
     feature_columns = [
@@ -82,16 +66,48 @@ def day_7_feature_engineering():
 
     # --- Task 3: Encode Categorical Variables ---
     print("\n[Task 3/3] Applying one-hot encoding to categorical features...")
+    checkpoint('Task 3: Applying one-hot encoding to categorical features', df)
 
     # Use pandas get_dummies to perform one-hot encoding
     X_processed = pd.get_dummies(X, columns=['neighbourhood_group', 'room_type'], drop_first=True)
 
     print("Categorical variables successfully encoded.")
+    track_frame('feature_matrix', X_processed)
     print(f"Shape of the final feature matrix: {X_processed.shape}")
     print("Sample of new columns created:")
     print(X_processed.columns)
     print("-" * 50)
 
+    return X_processed, y_log
+
+
+def day_7_feature_engineering():
+    """
+    Prepares and transforms the dataset for machine learning by creating
+    new features, selecting variables, and encoding categorical data.
+    """
+    print("--- Starting Day 7: Feature Engineering for Machine Learning ---")
+
+    # Define file paths
+    cleaned_data_path = '../data/processed/cleaned_airbnb_data.csv'
+    processed_dir = '../data/processed/'
+    features_path = os.path.join(processed_dir, 'model_features.csv')
+    target_path = os.path.join(processed_dir, 'model_target.csv')
+
+    # --- Load Data ---
+    if not os.path.exists(cleaned_data_path):
+        print(f"Error: Cleaned data file not found at '{cleaned_data_path}'")
+        return
+
+    try:
+        df = load_cleaned_data(cleaned_data_path, parse_dates=['last_review'])
+        print(f"Successfully loaded cleaned data. Shape: {df.shape}")
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+
+    X_processed, y_log = build_feature_matrix(df)
+
     # --- Save Processed Data ---
     print("Saving the final processed feature matrix and target vector...")
     try:
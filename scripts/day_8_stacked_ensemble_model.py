@@ -1,12 +1,39 @@
 import pandas as pd
 import numpy as np
 import os
-from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor, StackingRegressor
 from sklearn.linear_model import Ridge
 from xgboost import XGBRegressor
 from lightgbm import LGBMRegressor
 from sklearn.metrics import mean_absolute_error, r2_score
+from instrumentation import checkpoint
+from drift_monitor import DriftReference, REFERENCE_PATH
+from data_store import load_string_dictionary
+from backtesting import time_holdout_split
+
+
+def build_stacked_model(n_jobs=-1):
+    """
+    Returns the (unfitted) stacked ensemble: RF, XGBoost and LightGBM base
+    models combined by a Ridge meta-learner.
+    """
+    # Define the base models
+    base_models = [
+        ('rf', RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)),
+        ('xgb', XGBRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)),
+        ('lgbm', LGBMRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs))
+    ]
+
+    # Define the meta-learner
+    meta_learner = Ridge(alpha=1.0)
+
+    # Create the Stacking Ensemble
+    return StackingRegressor(
+        estimators=base_models,
+        final_estimator=meta_learner,
+        cv=5,  # Use 5-fold cross-validation to generate predictions for the meta-learner
+        n_jobs=n_jobs
+    )
 
 
 def day_8_model_training():
@@ -34,45 +61,32 @@ def day_8_model_training():
         return
 
     # --- Task 1: Train-Test Split ---
-    print("\n[Task 1/4] Splitting data into training (80%) and testing (20%) sets...")
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+    print("\n[Task 1/4] Splitting data into training (80%) and testing (20%) sets by review time...")
+    checkpoint('Task 1: Splitting data into training (80%) and testing (20%) sets', X)
+    # The most recently reviewed 20% is held out; the split is persisted for Day 9
+    X_train, X_test, y_train, y_test = time_holdout_split(X, y, test_size=0.2)
     print(f"Training set size: {X_train.shape[0]} samples")
     print(f"Testing set size: {X_test.shape[0]} samples")
     print("-" * 50)
 
     # --- Task 2: Model Selection (Base Models & Meta-Learner) ---
     print("\n[Task 2/4] Defining base models and meta-learner for the stacked ensemble...")
+    checkpoint('Task 2: Defining base models and meta-learner for the stacked ensemble', X)
 
-    # Define the base models
-    base_models = [
-        ('rf', RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)),
-        ('xgb', XGBRegressor(n_estimators=100, random_state=42, n_jobs=-1)),
-        ('lgbm', LGBMRegressor(n_estimators=100, random_state=42, n_jobs=-1))
-    ]
-
-    # Define the meta-learner
-    meta_learner = Ridge(alpha=1.0)
-
-    # Create the Stacking Ensemble
-    stacked_model = StackingRegressor(
-        estimators=base_models,
-        final_estimator=meta_learner,
-        cv=5,  # Use 5-fold cross-validation to generate predictions for the meta-learner
-        n_jobs=-1
-    )
+    stacked_model = build_stacked_model()
     print("Stacked Generalization Ensemble configured successfully.")
     print("-" * 50)
 
     # --- Task 3: Model Training ---
     print("\n[Task 3/4] Training the stacked ensemble model... (This may take a few minutes)")
+    checkpoint('Task 3: Training the stacked ensemble model', X)
     stacked_model.fit(X_train, y_train)
     print("Model training complete.")
     print("-" * 50)
 
     # --- Task 4: Prediction & Rigorous Evaluation ---
     print("\n[Task 4/4] Making predictions and evaluating the model...")
+    checkpoint('Task 4: Making predictions and evaluating the model', X)
 
     # Make predictions on the test set
     log_predictions = stacked_model.predict(X_test)
@@ -101,6 +115,12 @@ def day_8_model_training():
     joblib.dump(stacked_model, model_path)
     print(f"Trained model saved to '{model_path}'")
 
+    # Reference feature histograms for drift monitoring in the prediction path
+    # Borough categories come from the Day 2 dictionary so the dropped baseline gets its real name
+    boroughs = load_string_dictionary().get('neighbourhood_group')
+    DriftReference.fit(X_train, boroughs=boroughs).save(REFERENCE_PATH)
+    print(f"Drift reference histograms saved to '{REFERENCE_PATH}'")
+
     print("\n--- Day 8 Model Training & Evaluation Complete ---")
 
 
@@ -2,10 +2,15 @@ import pandas as pd
 import numpy as np
 import os
 import joblib
-from sklearn.model_selection import train_test_split
 from sklearn.inspection import permutation_importance
 import matplotlib.pyplot as plt
 import seaborn as sns
+from instrumentation import checkpoint
+from data_store import load_cleaned_data
+from backtesting import time_holdout_split
+from drift_monitor import DriftMonitor, DriftReference, REFERENCE_PATH
+from prediction_cache import PredictionCache, SHARED_CACHE_PATH
+from listing_attribution import StackedAttributor, top_drivers
 
 
 def day_9_model_interpretation():
@@ -32,17 +37,25 @@ def day_9_model_interpretation():
         X = pd.read_csv(features_path)
         y = pd.read_csv(target_path).iloc[:, 0]
         # Load original cleaned data to get true median values for simulation
-        df_cleaned = pd.read_csv(cleaned_data_path)
+        df_cleaned = load_cleaned_data(cleaned_data_path)
+        # Drift reference is optional; models trained before it existed still score
+        drift_monitor = DriftMonitor(DriftReference.load(REFERENCE_PATH)) if os.path.exists(REFERENCE_PATH) else None
         print("Successfully loaded trained model and all required datasets.")
     except Exception as e:
         print(f"Error loading files: {e}")
         return
 
-    # Re-create a test set for permutation importance calculation
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    # Reuse Day 8's persisted hold-out set for permutation importance
+    X_train, X_test, y_train, y_test = time_holdout_split(X, y, test_size=0.2)
+
+    # The hold-out listings are the most recently reviewed ones, i.e. the closest thing
+    # to new scoring traffic; check them against the training distribution
+    if drift_monitor is not None:
+        print(f"Drift check on the {len(X_test)} hold-out listings: {drift_monitor.update(X_test).summary()}")
 
     # --- Task 1: Feature Importance Analysis (using Permutation Importance) ---
     print("\n[Task 1/2] Calculating feature importance using Permutation Importance...")
+    checkpoint('Task 1: Calculating feature importance using Permutation Importance', X)
     print("This method is model-agnostic and ideal for interpreting stacked ensembles.")
 
     # Calculate permutation importance on the test set
@@ -78,6 +91,7 @@ def day_9_model_interpretation():
 
     # --- Task 2: "What-If" Price Simulation ---
     print("\n[Task 2/2] Running 'What-If' Price Simulation...")
+    checkpoint('Task 2: Running What-If Price Simulation', X)
 
     # FIX: Re-engineer 'days_since_last_review' on df_cleaned before calculating medians
     print("Re-engineering 'days_since_last_review' for simulation medians...")
@@ -133,7 +147,10 @@ def day_9_model_interpretation():
     sim_df_processed = sim_df_encoded.reindex(columns=X.columns, fill_value=0)
 
     # Make predictions
-    log_predictions = model.predict(sim_df_processed)
+    # Scenario templates repeat across runs; the persistent cache serves them without re-running the stack
+    prediction_cache = PredictionCache.for_model(model, model_path, columns=X.columns, shared_path=SHARED_CACHE_PATH)
+    log_predictions = prediction_cache.predict(sim_df_processed)
+    print(f"Prediction cache: {prediction_cache.stats()}")
 
     # Inverse transform predictions to get dollar amounts
     predicted_prices = np.expm1(log_predictions)
@@ -156,6 +173,11 @@ def day_9_model_interpretation():
     print(f"Scenario B (Get a Recent Review):       ${price_change_B:+.2f}")
     print(f"Scenario C (Move to Bronx):             ${price_change_C:+.2f}")
 
+    # Per-scenario drivers of the predicted log1p(price)
+    attributions = StackedAttributor(model, feature_names=X.columns).explain(sim_df_processed)
+    print("\nTop Price Drivers per Scenario (log1p(price) contributions):")
+    print(top_drivers(attributions).round(3))
+
     print("\n--- Day 9 Model Interpretation & Simulation Complete ---")
 
 
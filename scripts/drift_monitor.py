@@ -0,0 +1,247 @@
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+
+REFERENCE_PATH = '../models/drift_reference.json'
+
+# One-hot borough columns come from get_dummies(drop_first=True) in Day 7, so
+# the first borough alphabetically has no column of its own
+BOROUGH_PREFIX = 'neighbourhood_group_'
+# Label of the dropped borough when the training categories are not known
+UNKNOWN_BASELINE = '(baseline borough)'
+
+# Conventional PSI thresholds: below 0.1 stable, above 0.25 a major shift
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+EPSILON = 1e-4
+
+
+def baseline_borough(borough_columns, boroughs=None):
+    """
+    Returns the borough that get_dummies(drop_first=True) left without a
+    column: the first of the training categories `boroughs` that has no
+    one-hot column.
+    """
+    encoded = {c[len(BOROUGH_PREFIX):] for c in borough_columns}
+    dropped = sorted(str(b) for b in boroughs or [] if str(b) not in encoded)
+    return dropped[0] if dropped else UNKNOWN_BASELINE
+
+
+def _borough_codes(X, borough_columns):
+    """Recovers a borough code per row from the one-hot borough columns."""
+    if not borough_columns:
+        return np.zeros(len(X), dtype=np.int64)
+    one_hot = X[borough_columns].to_numpy(dtype=np.float64)
+    # Rows with no borough flag set belong to the dropped baseline borough (code 0)
+    return np.where(one_hot.max(axis=1) > 0, one_hot.argmax(axis=1) + 1, 0)
+
+
+class DriftReference:
+    """
+    Compact reference distribution of the training features: per-feature
+    quantile bin edges and bin counts, overall and per borough. Stored as
+    JSON next to the model.
+    """
+
+    def __init__(self, features, edges, counts, borough_labels, borough_counts):
+        self.features = list(features)
+        self.edges = [np.asarray(e, dtype=np.float64) for e in edges]
+        self.counts = np.asarray(counts, dtype=np.float64)
+        self.borough_labels = list(borough_labels)
+        self.borough_counts = np.asarray(borough_counts, dtype=np.float64)
+
+        n_bins = np.array([len(e) + 1 for e in self.edges])
+        self.offsets = np.concatenate([[0], np.cumsum(n_bins)]).astype(np.int64)
+        self.borough_columns = [f'{BOROUGH_PREFIX}{b}' for b in self.borough_labels[1:]]
+
+    @property
+    def n_bins_total(self):
+        return int(self.offsets[-1])
+
+    def bin_indices(self, X):
+        """
+        Maps a feature batch to global bin ids of shape (rows, features):
+        feature j's bins occupy offsets[j]:offsets[j + 1].
+        """
+        values = X[self.features].to_numpy(dtype=np.float64)
+        bins = np.empty(values.shape, dtype=np.int64)
+        for j, edges in enumerate(self.edges):
+            bins[:, j] = np.searchsorted(edges, values[:, j], side='right')
+        return bins + self.offsets[:-1]
+
+    def borough_codes(self, X):
+        return _borough_codes(X, [c for c in self.borough_columns if c in X.columns])
+
+    @classmethod
+    def fit(cls, X, bins=10, boroughs=None):
+        """
+        Builds the reference from the training feature matrix. `boroughs`
+        are the borough categories the features were encoded from (e.g. the
+        'neighbourhood_group' entry of Day 2's string dictionary); they name
+        the baseline borough that has no one-hot column.
+        """
+        features = list(X.columns)
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        edges = [np.unique(np.quantile(X[col].to_numpy(dtype=np.float64), quantiles)) for col in features]
+
+        borough_columns = sorted(c for c in features if c.startswith(BOROUGH_PREFIX))
+        borough_labels = ([baseline_borough(borough_columns, boroughs)]
+                          + [c[len(BOROUGH_PREFIX):] for c in borough_columns])
+
+        reference = cls(features, edges, [], borough_labels, [])
+        global_bins = reference.bin_indices(X)
+        codes = reference.borough_codes(X)
+        total = reference.n_bins_total
+        reference.counts = np.bincount(global_bins.ravel(), minlength=total).astype(np.float64)
+        reference.borough_counts = np.bincount(
+            (codes[:, None] * total + global_bins).ravel(), minlength=len(borough_labels) * total
+        ).reshape(len(borough_labels), total).astype(np.float64)
+        return reference
+
+    def to_dict(self):
+        return {
+            'features': self.features,
+            'edges': [e.tolist() for e in self.edges],
+            'counts': self.counts.astype(np.int64).tolist(),
+            'borough_labels': self.borough_labels,
+            'borough_counts': self.borough_counts.astype(np.int64).tolist(),
+        }
+
+    def save(self, path=REFERENCE_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+    @classmethod
+    def load(cls, path=REFERENCE_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data['features'], data['edges'], data['counts'],
+                   data['borough_labels'], data['borough_counts'])
+
+
+def _segment_stats(reference_counts, current_counts, offsets):
+    """
+    PSI and binned KS per feature for one or more rows of histograms laid
+    out back to back (feature j in offsets[j]:offsets[j + 1]).
+    """
+    starts = offsets[:-1]
+    ref_totals = np.add.reduceat(reference_counts, starts, axis=-1)
+    cur_totals = np.add.reduceat(current_counts, starts, axis=-1)
+    n_bins = np.diff(offsets)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p = reference_counts / np.repeat(ref_totals, n_bins, axis=-1)
+        q = current_counts / np.repeat(cur_totals, n_bins, axis=-1)
+    p = np.clip(np.nan_to_num(p), EPSILON, None)
+    q = np.clip(np.nan_to_num(q), EPSILON, None)
+    psi = np.add.reduceat((q - p) * np.log(q / p), starts, axis=-1)
+
+    # Within-feature CDFs: global cumulative sum minus the sum before the feature starts
+    cdf_p = np.cumsum(p, axis=-1)
+    cdf_q = np.cumsum(q, axis=-1)
+    before_p = np.repeat(cdf_p[..., starts] - p[..., starts], n_bins, axis=-1)
+    before_q = np.repeat(cdf_q[..., starts] - q[..., starts], n_bins, axis=-1)
+    ks = np.maximum.reduceat(np.abs((cdf_p - before_p) - (cdf_q - before_q)), starts, axis=-1)
+
+    empty = (ref_totals == 0) | (cur_totals == 0)
+    psi = np.where(empty, np.nan, psi)
+    ks = np.where(empty, np.nan, ks)
+    return psi, ks, cur_totals
+
+
+class DriftMonitor:
+    """
+    Streaming drift check against a DriftReference. Each scoring batch
+    only adds to running bin counts (two bincounts per batch); PSI and KS
+    are computed from the accumulated histograms on demand.
+    """
+
+    def __init__(self, reference, min_rows=500):
+        self.reference = reference
+        self.min_rows = min_rows
+        total = reference.n_bins_total
+        self.counts = np.zeros(total)
+        self.borough_counts = np.zeros((len(reference.borough_labels), total))
+        self.rows = 0
+
+    def update(self, X):
+        global_bins = self.reference.bin_indices(X)
+        codes = self.reference.borough_codes(X)
+        total = self.reference.n_bins_total
+        self.counts += np.bincount(global_bins.ravel(), minlength=total)
+        self.borough_counts += np.bincount(
+            (codes[:, None] * total + global_bins).ravel(), minlength=self.borough_counts.size
+        ).reshape(self.borough_counts.shape)
+        self.rows += len(X)
+        return self
+
+    def report(self, by_borough=False):
+        """
+        Returns PSI and KS per feature (optionally per borough as well),
+        with a status column. Statistics need at least `min_rows` rows.
+        """
+        ref = self.reference
+        psi, ks, _ = _segment_stats(ref.counts, self.counts, ref.offsets)
+        result = pd.DataFrame({'segment': 'all', 'feature': ref.features, 'rows': self.rows,
+                               'psi': psi, 'ks': ks})
+        if by_borough:
+            b_psi, b_ks, b_rows = _segment_stats(ref.borough_counts, self.borough_counts, ref.offsets)
+            n_boroughs, n_features = b_psi.shape
+            result = pd.concat([result, pd.DataFrame({
+                'segment': np.repeat(ref.borough_labels, n_features),
+                'feature': np.tile(ref.features, n_boroughs),
+                'rows': b_rows[:, 0].repeat(n_features).astype(np.int64),
+                'psi': b_psi.ravel(),
+                'ks': b_ks.ravel(),
+            })], ignore_index=True)
+
+        result['status'] = np.select(
+            [result['rows'] < self.min_rows, result['psi'] >= PSI_ALERT, result['psi'] >= PSI_WARNING],
+            ['insufficient rows', 'major drift', 'moderate drift'], default='stable')
+        return result
+
+    def summary(self):
+        """One-line status of the accumulated batches."""
+        if self.rows < self.min_rows:
+            return f"{self.rows} rows accumulated; drift statistics need at least {self.min_rows}."
+        report = self.report()
+        worst = report.loc[report['psi'].idxmax()]
+        return (f"{self.rows} rows checked; max PSI {worst['psi']:.3f} on '{worst['feature']}' "
+                f"({worst['status']}).")
+
+
+def monitored_predict(model, X, monitor=None):
+    """Predicts with `model` after adding the batch to the drift monitor."""
+    if monitor is not None:
+        monitor.update(X)
+    return model.predict(X)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check a batch of encoded listings for feature drift.')
+    parser.add_argument('batch', help='CSV with the same columns as model_features.csv.')
+    parser.add_argument('--reference', default=REFERENCE_PATH)
+    parser.add_argument('--by-borough', action='store_true')
+    args = parser.parse_args()
+
+    print("--- Feature Drift Check ---")
+    if not os.path.exists(args.reference):
+        print(f"Error: Drift reference not found at '{args.reference}'. Please run the Day 8 script first.")
+        return
+
+    reference = DriftReference.load(args.reference)
+    monitor = DriftMonitor(reference)
+    for chunk in pd.read_csv(args.batch, chunksize=100_000):
+        monitor.update(chunk.reindex(columns=reference.features, fill_value=0))
+
+    report = monitor.report(by_borough=args.by_borough)
+    print(report.round(4).to_string(index=False))
+    print(f"\n{monitor.summary()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,330 @@
+import argparse
+import datetime
+import json
+import os
+import numpy as np
+import pandas as pd
+
+RAW_DATA_PATH = r'C:\Users\jaiku\PycharmProjects\Airbnb_Analysis\data\raw\1730285881-Airbnb_Open_Data.xlsx'
+PROFILES_DIR = '../reports/profiles'
+
+_UINT64_ONE = np.uint64(1)
+
+
+def _bit_length(x):
+    """Vectorized int.bit_length() for an array of uint64 values."""
+    x = x.copy()
+    length = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = x >= (_UINT64_ONE << np.uint64(shift))
+        length[high] += shift
+        x[high] >>= np.uint64(shift)
+    return length + (x > 0)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch with 2**p registers (p=14 gives about
+    0.8% standard error in 16 KB). Sketches of different chunks merge with
+    an element-wise maximum.
+    """
+
+    def __init__(self, p=14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def add(self, values):
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy(dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        remainder = hashes << np.uint64(self.p)
+        # Rank = position of the leftmost 1-bit in the remaining 64 - p bits
+        rank = np.where(remainder == 0, 64 - self.p + 1, 64 - _bit_length(remainder) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * self.m and zeros:
+            # Small-range correction (linear counting)
+            return float(self.m * np.log(self.m / zeros))
+        return float(raw)
+
+
+class StreamingHistogram:
+    """
+    Fixed-size histogram built in one pass. The first chunk sets the range;
+    when later values fall outside it, the bin width doubles (adjacent bins
+    are merged pairwise) until the range covers them, so counts stay exact
+    without a second pass over the data.
+    """
+
+    def __init__(self, bins=32):
+        if bins % 2:
+            raise ValueError("The number of bins must be even.")
+        self.bins = bins
+        self.lo = None
+        self.width = None
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def _merged(self):
+        return self.counts.reshape(-1, 2).sum(axis=1)
+
+    def add(self, values):
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        vmin, vmax = float(values.min()), float(values.max())
+        if self.lo is None:
+            span = vmax - vmin
+            self.lo = vmin
+            self.width = span / self.bins if span > 0 else max(abs(vmin), 1.0) / self.bins
+
+        while vmax > self.lo + self.width * self.bins:
+            self.counts = np.concatenate([self._merged(), np.zeros(self.bins // 2, dtype=np.int64)])
+            self.width *= 2
+        while vmin < self.lo:
+            self.counts = np.concatenate([np.zeros(self.bins // 2, dtype=np.int64), self._merged()])
+            self.lo -= self.width * self.bins
+            self.width *= 2
+
+        positions = np.clip(((values - self.lo) / self.width).astype(np.int64), 0, self.bins - 1)
+        self.counts += np.bincount(positions, minlength=self.bins)
+
+    def to_dict(self):
+        return {'lo': self.lo, 'width': self.width, 'counts': self.counts.tolist()}
+
+
+class ColumnProfiler:
+    """Accumulates the profile of one column across chunks."""
+
+    def __init__(self, name, top_k=20, top_k_capacity=1000, bins=32):
+        self.name = name
+        self.kind = None
+        self.count = 0
+        self.null_count = 0
+        self.minimum = None
+        self.maximum = None
+        self.total = 0.0
+        self.hll = HyperLogLog()
+        self.histogram = StreamingHistogram(bins)
+        self.top_k = top_k
+        self.top_k_capacity = top_k_capacity
+        self.top_counts = pd.Series(dtype=np.int64)
+
+    def update(self, series):
+        self.count += len(series)
+        nulls = series.isna()
+        self.null_count += int(nulls.sum())
+        values = series[~nulls]
+        if values.empty:
+            return
+
+        if pd.api.types.is_bool_dtype(values):
+            values = values.astype(np.int64)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            kind = 'datetime'
+            numeric = values.astype('datetime64[ns]').astype(np.int64).to_numpy(dtype=np.float64)
+        elif pd.api.types.is_numeric_dtype(values):
+            kind = 'numeric'
+            numeric = values.to_numpy(dtype=np.float64)
+        else:
+            kind = 'text'
+
+        if self.kind is not None and self.kind != kind and 'text' in (self.kind, kind):
+            # A column that is text in any chunk is profiled as text from then on
+            if self.kind != 'text':
+                self.minimum = self.maximum = None
+            kind = 'text'
+        if kind == 'text':
+            numeric = None
+            values = values.astype(str)
+        self.kind = kind
+
+        self.hll.add(values.to_numpy())
+
+        if numeric is not None:
+            chunk_min, chunk_max = float(numeric.min()), float(numeric.max())
+            self.total += float(numeric.sum())
+            self.histogram.add(numeric)
+        else:
+            chunk_min, chunk_max = values.min(), values.max()
+        self.minimum = chunk_min if self.minimum is None else min(self.minimum, chunk_min)
+        self.maximum = chunk_max if self.maximum is None else max(self.maximum, chunk_max)
+
+        if self.kind != 'numeric' or pd.api.types.is_integer_dtype(series):
+            # Bounded heavy-hitter counts: keep only the largest `top_k_capacity` entries
+            self.top_counts = self.top_counts.add(values.value_counts(), fill_value=0)
+            if len(self.top_counts) > self.top_k_capacity:
+                self.top_counts = self.top_counts.nlargest(self.top_k_capacity)
+
+    def _format(self, value):
+        if value is None:
+            return None
+        if self.kind == 'datetime':
+            return pd.Timestamp(int(value)).isoformat()
+        return value
+
+    def to_dict(self):
+        non_null = self.count - self.null_count
+        profile = {
+            'kind': self.kind,
+            'count': self.count,
+            'null_count': self.null_count,
+            'null_rate': round(self.null_count / self.count, 6) if self.count else None,
+            'distinct_estimate': int(round(self.hll.estimate())),
+            'min': self._format(self.minimum),
+            'max': self._format(self.maximum),
+        }
+        if self.kind in ('numeric', 'datetime'):
+            profile['histogram'] = self.histogram.to_dict()
+        if self.kind == 'numeric' and non_null:
+            profile['mean'] = self.total / non_null
+        if not self.top_counts.empty:
+            top = self.top_counts.nlargest(self.top_k)
+            profile['top_values'] = [[str(k), int(v)] for k, v in top.items()]
+        return profile
+
+
+def iter_chunks(path, chunksize=100_000):
+    """
+    Yields a data file as DataFrame chunks without loading it fully.
+    Supports CSV, Parquet and Excel (streamed row by row with openpyxl).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        yield from pd.read_csv(path, chunksize=chunksize, low_memory=False)
+    elif extension == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif extension in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(col) for col in next(rows)]
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == chunksize:
+                    yield pd.DataFrame(batch, columns=header).infer_objects()
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=header).infer_objects()
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unsupported file type '{extension}'.")
+
+
+def profile_chunks(chunks, source=None, top_k=20):
+    """Profiles every column of a stream of DataFrame chunks in a single pass."""
+    profilers = {}
+    n_rows = 0
+    for chunk in chunks:
+        n_rows += len(chunk)
+        for col in chunk.columns:
+            if col not in profilers:
+                profilers[col] = ColumnProfiler(col, top_k=top_k)
+            profilers[col].update(chunk[col])
+
+    return {
+        'source': source,
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'rows': n_rows,
+        'columns': {str(col): profiler.to_dict() for col, profiler in profilers.items()},
+    }
+
+
+def profile_file(path, chunksize=100_000, top_k=20):
+    return profile_chunks(iter_chunks(path, chunksize), source=os.path.abspath(path), top_k=top_k)
+
+
+def save_profile(profile, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        # Compact separators: profiles are machine-read and diffed, not edited by hand
+        json.dump(profile, f, separators=(',', ':'), default=str)
+    return path
+
+
+def diff_profiles(old, new, tolerance=0.05):
+    """
+    Compares two profiles and returns a list of human-readable changes:
+    added/removed columns, kind changes, null-rate shifts, cardinality
+    changes beyond `tolerance` (relative), and min/max/mean movements.
+    """
+    changes = []
+    if old['rows'] != new['rows']:
+        changes.append(f"Row count: {old['rows']:,} -> {new['rows']:,}")
+
+    old_cols, new_cols = old['columns'], new['columns']
+    for col in new_cols.keys() - old_cols.keys():
+        changes.append(f"[{col}] new column")
+    for col in old_cols.keys() - new_cols.keys():
+        changes.append(f"[{col}] column removed")
+
+    for col in old_cols.keys() & new_cols.keys():
+        a, b = old_cols[col], new_cols[col]
+        if a['kind'] != b['kind']:
+            changes.append(f"[{col}] kind {a['kind']} -> {b['kind']}")
+        if a['null_rate'] is not None and b['null_rate'] is not None \
+                and abs(b['null_rate'] - a['null_rate']) > tolerance / 10:
+            changes.append(f"[{col}] null rate {a['null_rate']:.4f} -> {b['null_rate']:.4f}")
+        old_distinct, new_distinct = a['distinct_estimate'], b['distinct_estimate']
+        if old_distinct and abs(new_distinct - old_distinct) / old_distinct > tolerance:
+            changes.append(f"[{col}] distinct values ~{old_distinct:,} -> ~{new_distinct:,}")
+        for stat in ('min', 'max'):
+            if a.get(stat) != b.get(stat):
+                changes.append(f"[{col}] {stat} {a.get(stat)} -> {b.get(stat)}")
+        if 'mean' in a and 'mean' in b and a['mean']:
+            shift = (b['mean'] - a['mean']) / abs(a['mean'])
+            if abs(shift) > tolerance:
+                changes.append(f"[{col}] mean {a['mean']:.4f} -> {b['mean']:.4f} ({shift:+.1%})")
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single-pass streaming data profiler.')
+    parser.add_argument('path', nargs='?', default=RAW_DATA_PATH, help='CSV, Parquet or Excel file.')
+    parser.add_argument('--output', default=None, help='Where to write the JSON profile.')
+    parser.add_argument('--baseline', default=None, help='Earlier JSON profile to diff against.')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args()
+
+    print("--- Fast Data Profiling ---")
+    if not os.path.exists(args.path):
+        print(f"Error: Data file not found at '{args.path}'")
+        return
+
+    profile = profile_file(args.path, chunksize=args.chunksize)
+    name = os.path.splitext(os.path.basename(args.path))[0]
+    output = args.output or os.path.join(PROFILES_DIR, f'{name}.profile.json')
+    save_profile(profile, output)
+    print(f"Profiled {profile['rows']:,} rows and {len(profile['columns'])} columns.")
+
+    print(f"\n{'Column':<32} {'Kind':<9} {'Nulls':>9} {'Distinct~':>10}  Min / Max")
+    for col, stats in profile['columns'].items():
+        print(f"{col[:32]:<32} {str(stats['kind']):<9} {stats['null_count']:>9,} "
+              f"{stats['distinct_estimate']:>10,}  {stats['min']} / {stats['max']}")
+    print(f"\nProfile saved to '{output}'")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        changes = diff_profiles(baseline, profile)
+        print(f"\nChanges vs. baseline '{args.baseline}':")
+        print('\n'.join(f"  {c}" for c in changes) if changes else "  No significant changes.")
+
+    print("\n--- Fast Data Profiling Complete ---")
+
+
+if __name__ == '__main__':
+    main()
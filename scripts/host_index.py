@@ -0,0 +1,165 @@
+import pandas as pd
+import numpy as np
+import os
+from data_store import load_cleaned_data
+
+
+class HostIndex:
+    """
+    Host-level entity index over the cleaned listings, keyed on 'host_id'.
+
+    Listings are grouped once by a stable sort on 'host_id' and stored in a
+    CSR-style layout: `offsets[i]:offsets[i + 1]` slices `order` to give the
+    row positions of the i-th host's listings. Per-host aggregates, top-k
+    queries and portfolio lookups then work on contiguous slices instead of
+    rescanning the full frame for every question.
+    """
+
+    def __init__(self, df, host_col='host_id', name_col='host_name'):
+        if host_col not in df.columns:
+            raise KeyError(f"Column '{host_col}' not found in the listings data.")
+
+        self.df = df
+        self.host_col = host_col
+        self.name_col = name_col
+
+        keys = df[host_col].to_numpy()
+        # Stable sort keeps each host's listings in their original row order
+        self.order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[self.order]
+
+        # Boundaries between consecutive hosts in the sorted key array
+        if len(sorted_keys):
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        else:
+            starts = np.array([], dtype=np.int64)
+        self.host_ids = sorted_keys[starts]
+        self.offsets = np.append(starts, len(sorted_keys)).astype(np.int64)
+        self.listing_counts = np.diff(self.offsets)
+
+        self._sorted_columns = {}
+
+    @property
+    def n_hosts(self):
+        return len(self.host_ids)
+
+    def _sorted_values(self, column):
+        # Each column is gathered into host order at most once and then reused
+        if column not in self._sorted_columns:
+            values = self.df[column].to_numpy(dtype=np.float64)
+            self._sorted_columns[column] = values[self.order]
+        return self._sorted_columns[column]
+
+    def _position(self, host_id):
+        pos = np.searchsorted(self.host_ids, host_id)
+        if pos >= self.n_hosts or self.host_ids[pos] != host_id:
+            raise KeyError(f"Host id {host_id} is not in the index.")
+        return pos
+
+    def aggregate(self, column, how='mean'):
+        """
+        Returns a per-host aggregate of `column` as a Series indexed by host id.
+        Supported aggregates: 'sum', 'mean', 'min', 'max', 'count'.
+        """
+        if how == 'count':
+            return pd.Series(self.listing_counts, index=self.host_ids, name='listing_count')
+        if self.n_hosts == 0:
+            return pd.Series(dtype=np.float64, name=f'{column}_{how}')
+
+        values = self._sorted_values(column)
+        starts = self.offsets[:-1]
+        if how == 'sum':
+            result = np.add.reduceat(values, starts)
+        elif how == 'mean':
+            result = np.add.reduceat(values, starts) / self.listing_counts
+        elif how == 'min':
+            result = np.minimum.reduceat(values, starts)
+        elif how == 'max':
+            result = np.maximum.reduceat(values, starts)
+        else:
+            raise ValueError(f"Unsupported aggregate '{how}'.")
+        return pd.Series(result, index=self.host_ids, name=f'{column}_{how}')
+
+    def top_k(self, k=10, column=None, how='sum'):
+        """
+        Returns the k hosts with the largest value of a metric. With no
+        `column`, hosts are ranked by listing count.
+        """
+        if column is None:
+            metric = self.aggregate(None, how='count')
+        else:
+            metric = self.aggregate(column, how=how)
+
+        k = min(k, self.n_hosts)
+        if k == 0:
+            return metric.iloc[:0]
+        values = metric.to_numpy()
+        # argpartition selects the top k in linear time; only those k are sorted
+        top = np.argpartition(-values, k - 1)[:k]
+        top = top[np.lexsort((self.host_ids[top], -values[top]))]
+        result = metric.iloc[top]
+        result.index.name = self.host_col
+        return result
+
+    def host_names(self, host_ids):
+        """Returns the display name of each host (taken from its first listing)."""
+        names = self.df[self.name_col].to_numpy()
+        positions = [self._position(h) for h in host_ids]
+        first_rows = self.order[self.offsets[positions]]
+        return pd.Series(names[first_rows], index=pd.Index(host_ids, name=self.host_col), name=self.name_col)
+
+    def listing_rows(self, host_ids):
+        """Returns the row positions of every listing owned by the given hosts."""
+        slices = []
+        for host_id in host_ids:
+            pos = self._position(host_id)
+            slices.append(self.order[self.offsets[pos]:self.offsets[pos + 1]])
+        if not slices:
+            return np.array([], dtype=np.int64)
+        return np.sort(np.concatenate(slices))
+
+    def portfolio(self, host_ids):
+        """Returns the listings owned by one host id or a list of host ids."""
+        if np.isscalar(host_ids):
+            host_ids = [host_ids]
+        return self.df.iloc[self.listing_rows(host_ids)]
+
+
+def run_host_index_report():
+    """
+    Builds the host index from the cleaned dataset and reports the largest
+    hosts by portfolio size and by total review volume.
+    """
+    print("--- Host Index: Power-Host Analytics ---")
+
+    cleaned_data_path = '../data/processed/cleaned_airbnb_data.csv'
+
+    # --- Load Data ---
+    if not os.path.exists(cleaned_data_path):
+        print(f"Error: Cleaned data file not found at '{cleaned_data_path}'")
+        return
+
+    try:
+        df = load_cleaned_data(cleaned_data_path)
+        print(f"Successfully loaded cleaned data. Shape: {df.shape}")
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+
+    index = HostIndex(df)
+    print(f"Indexed {len(df)} listings across {index.n_hosts} distinct host ids.")
+    print("-" * 50)
+
+    print("\nTop 10 Hosts by Listing Count:")
+    top_by_listings = index.top_k(10)
+    print(pd.concat([index.host_names(top_by_listings.index), top_by_listings], axis=1))
+
+    print("\nTop 10 Hosts by Total Number of Reviews:")
+    top_by_reviews = index.top_k(10, column='number_of_reviews', how='sum')
+    print(pd.concat([index.host_names(top_by_reviews.index), top_by_reviews], axis=1))
+
+    print("\n--- Host Index Report Complete ---")
+
+
+if __name__ == '__main__':
+    run_host_index_report()
@@ -0,0 +1,319 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import runpy
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # psutil is optional; fall back to the stdlib where available
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+TRACES_DIR = os.path.join(SCRIPTS_DIR, '..', 'reports', 'traces')
+
+# Pipeline stages in execution order, mapped to the script that implements them
+PIPELINE_STAGES = {
+    'day_1': 'day_1_data_profiling.py',
+    'day_2': 'day_2_data_cleaning.py',
+    'day_3': 'day_3_EDA.py',
+    'day_4': 'day_4_Pricing & Geographic Insights.py',
+    'day_5': 'day_5_Temporal_Analysis.py',
+    'day_6': 'day_6_host_performance_analysis.py',
+    'day_7': 'day_7_feature_engineering.py',
+    'day_8': 'day_8_stacked_ensemble_model.py',
+    'day_9': 'day_9_model_simulation.py',
+}
+
+_active_tracer = None
+
+
+def _peak_rss_mb():
+    """
+    Highest resident set size this process has reached since it started, in
+    MB, or None if unavailable. Stages subtract the value taken on entry to
+    get their own contribution.
+    """
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        # 'peak_wset' (peak working set) only exists on Windows
+        if hasattr(info, 'peak_wset'):
+            return round(info.peak_wset / 1024 ** 2, 2)
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+        divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+        return round(peak / divisor, 2)
+    return None
+
+
+def _rss_mb():
+    """Current resident set size of this process in MB, or None without psutil."""
+    if psutil is None:
+        return None
+    return round(psutil.Process().memory_info().rss / 1024 ** 2, 2)
+
+
+def _growth(start, end):
+    """Rise of a peak-memory reading between two snapshots, or None if unavailable."""
+    if start is None or end is None:
+        return None
+    return round(end - start, 2)
+
+
+def _frame_info(df):
+    """Shape and shallow memory footprint of a DataFrame (cheap to compute)."""
+    return {
+        'rows': int(df.shape[0]),
+        'columns': int(df.shape[1]) if df.ndim > 1 else 1,
+        'memory_mb': round(float(df.memory_usage(index=True, deep=False).sum()) / 1024 ** 2, 2),
+    }
+
+
+class PipelineTracer:
+    """
+    Records wall time, CPU time, peak RSS and tracemalloc peaks for every
+    pipeline stage and for named sub-steps inside a stage, and writes the
+    result as a JSON trace. 'peak_rss_growth_mb' is how far the process's
+    peak RSS rose during the entry; 'process_peak_rss_mb' is the process-wide
+    peak so far and is not compared entry by entry.
+    """
+
+    def __init__(self, run_name=None, trace_malloc=True):
+        self.run_name = run_name or datetime.datetime.now().strftime('run_%Y%m%d_%H%M%S')
+        self.trace_malloc = trace_malloc
+        self.stages = []
+        self._current = None
+        self._step = None
+
+    def _snapshot(self):
+        snap = {'wall': time.perf_counter(), 'cpu': time.process_time(), 'peak_rss_mb': _peak_rss_mb()}
+        if self.trace_malloc and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            snap['py_current_mb'] = round(current / 1024 ** 2, 2)
+            snap['py_peak_mb'] = round(peak / 1024 ** 2, 2)
+        return snap
+
+    def _close_step(self):
+        if self._step is None:
+            return
+        end = self._snapshot()
+        self._step.update({
+            'seconds': round(end['wall'] - self._step.pop('_wall'), 4),
+            'cpu_seconds': round(end['cpu'] - self._step.pop('_cpu'), 4),
+            'peak_rss_growth_mb': _growth(self._step.pop('_peak_rss'), end['peak_rss_mb']),
+            'process_peak_rss_mb': end['peak_rss_mb'],
+            'rss_mb': _rss_mb(),
+        })
+        if 'py_peak_mb' in end:
+            self._step['py_peak_mb'] = end['py_peak_mb']
+        self._current['steps'].append(self._step)
+        self._step = None
+
+    def _open_step(self, name, df=None):
+        start = self._snapshot()
+        self._step = {'name': name, '_wall': start['wall'], '_cpu': start['cpu'],
+                      '_peak_rss': start['peak_rss_mb']}
+        if df is not None:
+            self._step['frame'] = _frame_info(df)
+        if self.trace_malloc and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        """Times one pipeline stage; sub-steps are recorded via `checkpoint`."""
+        global _active_tracer
+        started_tracing = False
+        if self.trace_malloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+
+        self._current = {'name': name, 'status': 'ok', 'steps': [], 'frames': []}
+        start = self._snapshot()
+        self._open_step('(setup)')
+        previous, _active_tracer = _active_tracer, self
+        try:
+            yield self
+        except BaseException as e:
+            self._current['status'] = 'error'
+            self._current['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._close_step()
+            end = self._snapshot()
+            self._current.update({
+                'seconds': round(end['wall'] - start['wall'], 4),
+                'cpu_seconds': round(end['cpu'] - start['cpu'], 4),
+                'peak_rss_growth_mb': _growth(start['peak_rss_mb'], end['peak_rss_mb']),
+                'process_peak_rss_mb': end['peak_rss_mb'],
+                'rss_mb': _rss_mb(),
+            })
+            if self._current['steps']:
+                peaks = [s['py_peak_mb'] for s in self._current['steps'] if 'py_peak_mb' in s]
+                if peaks:
+                    self._current['py_peak_mb'] = max(peaks)
+            self.stages.append(self._current)
+            self._current = None
+            _active_tracer = previous
+            if started_tracing:
+                tracemalloc.stop()
+
+    def checkpoint(self, name, df=None):
+        """Ends the current sub-step and starts a new one called `name`."""
+        if self._current is None:
+            return
+        self._close_step()
+        self._open_step(name, df)
+
+    def track_frame(self, name, df):
+        """Records the size of a DataFrame at this point of the current stage."""
+        if self._current is None:
+            return
+        self._current['frames'].append({'name': name, **_frame_info(df)})
+
+    def to_dict(self):
+        return {
+            'run_name': self.run_name,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'tracemalloc': self.trace_malloc,
+            'total_seconds': round(sum(s['seconds'] for s in self.stages), 4),
+            'stages': self.stages,
+        }
+
+    def save(self, output_dir=TRACES_DIR):
+        """Writes the trace to '<output_dir>/<run_name>.json' and returns the path."""
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f'{self.run_name}.json')
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+def checkpoint(name, df=None):
+    """Marks the start of a sub-step in the active stage; a no-op when not tracing."""
+    if _active_tracer is not None:
+        _active_tracer.checkpoint(name, df)
+
+
+def track_frame(name, df):
+    """Records a DataFrame's size in the active stage; a no-op when not tracing."""
+    if _active_tracer is not None:
+        _active_tracer.track_frame(name, df)
+
+
+def load_trace(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_traces(baseline, current, threshold=0.10):
+    """
+    Compares two traces stage by stage (and sub-step by sub-step) and flags
+    entries whose wall time or memory grew by more than `threshold`.
+    Returns a list of row dicts.
+    """
+    def flatten(trace):
+        entries = {}
+        for stage in trace['stages']:
+            entries[stage['name']] = stage
+            for step in stage.get('steps', []):
+                entries[f"{stage['name']} / {step['name']}"] = step
+        return entries
+
+    base_entries, curr_entries = flatten(baseline), flatten(current)
+    rows = []
+    for key in curr_entries:
+        if key not in base_entries:
+            continue
+        base, curr = base_entries[key], curr_entries[key]
+        row = {'entry': key}
+        regressed = False
+        for metric in ['seconds', 'peak_rss_growth_mb', 'py_peak_mb']:
+            old, new = base.get(metric), curr.get(metric)
+            row[f'{metric}_baseline'] = old
+            row[f'{metric}_current'] = new
+            if old and new is not None:
+                change = (new - old) / old
+                row[f'{metric}_change'] = round(change, 4)
+                regressed = regressed or change > threshold
+        row['regression'] = regressed
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows, threshold=0.10):
+    lines = [f"{'Entry':<55} {'Time (s)':>21} {'Peak RSS rise (MB)':>23}  Status"]
+    for row in rows:
+        time_col = f"{row['seconds_baseline']} -> {row['seconds_current']}"
+        rss_col = f"{row['peak_rss_growth_mb_baseline']} -> {row['peak_rss_growth_mb_current']}"
+        status = f"REGRESSION (>{threshold:.0%})" if row['regression'] else 'ok'
+        lines.append(f"{row['entry'][:55]:<55} {time_col:>21} {rss_col:>23}  {status}")
+    return '\n'.join(lines)
+
+
+def run_pipeline(stage_names, run_name=None, trace_malloc=True, output_dir=TRACES_DIR):
+    """
+    Runs the given pipeline stages in order under a tracer and saves the
+    JSON trace. Scripts run from the 'scripts' directory, as they expect.
+    """
+    tracer = PipelineTracer(run_name, trace_malloc=trace_malloc)
+    original_cwd = os.getcwd()
+    os.chdir(SCRIPTS_DIR)
+    try:
+        for name in stage_names:
+            script_path = os.path.join(SCRIPTS_DIR, PIPELINE_STAGES[name])
+            with tracer.stage(name):
+                runpy.run_path(script_path, run_name='__main__')
+    finally:
+        os.chdir(original_cwd)
+        trace_path = tracer.save(output_dir)
+        print(f"\nTrace saved to '{trace_path}'")
+    return tracer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pipeline profiling and trace comparison.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run pipeline stages under the tracer.')
+    run_parser.add_argument('stages', nargs='*', default=list(PIPELINE_STAGES)[1:],
+                            help=f"Stages to run (default: day_2 .. day_9). Choices: {list(PIPELINE_STAGES)}")
+    run_parser.add_argument('--name', default=None, help='Run name used for the trace file.')
+    run_parser.add_argument('--no-tracemalloc', action='store_true',
+                            help='Disable tracemalloc (lower overhead, no Python heap peaks).')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two JSON traces.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10)
+
+    args = parser.parse_args()
+    # The day scripts import this module by name; when it runs as a script,
+    # point that name at this copy so their checkpoints reach the active tracer
+    sys.modules.setdefault('instrumentation', sys.modules[__name__])
+    if args.command == 'run':
+        unknown = [s for s in args.stages if s not in PIPELINE_STAGES]
+        if unknown:
+            parser.error(f"Unknown stages: {unknown}")
+        run_pipeline(args.stages, run_name=args.name, trace_malloc=not args.no_tracemalloc)
+    else:
+        rows = compare_traces(load_trace(args.baseline), load_trace(args.current), args.threshold)
+        print(format_comparison(rows, args.threshold))
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
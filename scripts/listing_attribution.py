@@ -0,0 +1,217 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from prediction_cache import PredictionCache, model_fingerprint
+
+MODEL_PATH = '../models/stacked_price_predictor.joblib'
+FEATURES_PATH = '../data/processed/model_features.csv'
+OUTPUT_PATH = '../reports/listing_attributions.csv'
+
+BASE_VALUE_COL = 'base_value'
+
+
+def _forest_attribution_matrix(forest, n_features):
+    """
+    Sparse (total nodes x features) matrix for Saabas-style path attribution
+    of a random forest. Row `i` holds the change in node value from the
+    parent of node `i` to node `i`, in the column of the parent's split
+    feature, divided by the number of trees. Multiplying the forest's
+    decision-path indicator by this matrix sums the value changes along
+    every sample's path in every tree in one sparse product.
+    """
+    rows, cols, data = [], [], []
+    roots = []
+    offset = 0
+    for tree in forest.estimators_:
+        t = tree.tree_
+        values = t.value[:, 0, 0]
+        parent = np.full(t.node_count, -1, dtype=np.int64)
+        internal = np.flatnonzero(t.children_left >= 0)
+        parent[t.children_left[internal]] = internal
+        parent[t.children_right[internal]] = internal
+
+        children = np.flatnonzero(parent >= 0)
+        rows.append(children + offset)
+        cols.append(t.feature[parent[children]])
+        data.append(values[children] - values[parent[children]])
+        roots.append(values[0])
+        offset += t.node_count
+
+    n_trees = len(forest.estimators_)
+    matrix = sparse.csr_matrix(
+        (np.concatenate(data) / n_trees, (np.concatenate(rows), np.concatenate(cols))),
+        shape=(offset, n_features))
+    return matrix, float(np.mean(roots))
+
+
+class StackedAttributor:
+    """
+    Per-listing additive attribution for the Day 8 stacked ensemble.
+
+    Each base model's prediction is split into a bias plus one contribution
+    per feature (TreeSHAP for XGBoost and LightGBM, path attribution for the
+    random forest). The Ridge meta-learner is linear in the base predictions,
+    so the ensemble's attribution is the meta-weighted sum of the base
+    attributions, and `base_value + contributions.sum(axis=1)` equals the
+    model's predicted log1p(price).
+    """
+
+    def __init__(self, model, feature_names=None):
+        self.model = model
+        self.feature_names = list(feature_names if feature_names is not None else model.feature_names_in_)
+        if getattr(model, 'passthrough', False):
+            raise ValueError("Attribution assumes the meta-learner sees only the base predictions (passthrough=False).")
+
+        self.base_names = [name for name, _ in model.estimators]
+        self.base_models = dict(zip(self.base_names, model.estimators_))
+        self.meta_weights = dict(zip(self.base_names, np.ravel(model.final_estimator_.coef_)))
+        self.meta_intercept = float(np.ravel(model.final_estimator_.intercept_)[0])
+        self._forest_matrices = {}
+
+    def _base_contributions(self, name, X):
+        """(rows, features + 1) contributions of one base model; the last column is its bias."""
+        estimator = self.base_models[name]
+        kind = type(estimator).__name__
+        if kind.startswith('XGB'):
+            import xgboost
+            return estimator.get_booster().predict(xgboost.DMatrix(X), pred_contribs=True)
+        if kind.startswith('LGBM'):
+            return np.asarray(estimator.predict(X, pred_contrib=True))
+        if hasattr(estimator, 'estimators_') and hasattr(estimator, 'decision_path'):
+            if name not in self._forest_matrices:
+                self._forest_matrices[name] = _forest_attribution_matrix(estimator, len(self.feature_names))
+            matrix, bias = self._forest_matrices[name]
+            indicator, _ = estimator.decision_path(X)
+            contributions = np.asarray((indicator @ matrix).todense())
+            return np.column_stack([contributions, np.full(len(X), bias)])
+        raise TypeError(f"No attribution method for base model '{name}' ({kind}).")
+
+    def base_contributions(self, X):
+        """Returns {base model name: (rows, features + 1) contribution array}."""
+        X = X.reindex(columns=self.feature_names, fill_value=0)
+        return {name: self._base_contributions(name, X) for name in self.base_names}
+
+    def explain_array(self, X):
+        """
+        Returns a (rows, features + 1) array: the ensemble's per-feature
+        contributions followed by the per-row base value.
+        """
+        combined = None
+        for name, contributions in self.base_contributions(X).items():
+            weighted = self.meta_weights[name] * contributions
+            combined = weighted if combined is None else combined + weighted
+        combined[:, -1] += self.meta_intercept
+        return combined
+
+    def explain(self, X):
+        """Attributions as a DataFrame with one column per feature plus 'base_value'."""
+        values = self.explain_array(X)
+        return pd.DataFrame(values, columns=self.feature_names + [BASE_VALUE_COL], index=X.index)
+
+    def cached(self, model_hash=None, **cache_kwargs):
+        """
+        Wraps `explain_array` in a PredictionCache so repeated listings are
+        only attributed once. Entries are namespaced separately from the
+        point predictions of the same model.
+        """
+        model_hash = model_hash or model_fingerprint(self.model)
+        return PredictionCache(self.explain_array, f'{model_hash}:attribution', columns=self.feature_names,
+                               **cache_kwargs)
+
+
+def top_drivers(attributions, k=3):
+    """
+    Returns the k features with the largest absolute contribution for each
+    listing, in log1p(price) units.
+    """
+    contributions = attributions.drop(columns=[BASE_VALUE_COL])
+    values = contributions.to_numpy()
+    top = np.argsort(-np.abs(values), axis=1)[:, :k]
+    names = np.asarray(contributions.columns)[top]
+    picked = np.take_along_axis(values, top, axis=1)
+    result = {}
+    for rank in range(k):
+        result[f'driver_{rank + 1}'] = names[:, rank]
+        result[f'contribution_{rank + 1}'] = picked[:, rank]
+    return pd.DataFrame(result, index=attributions.index)
+
+
+def run_attribution_report(n_rows=5000, output_path=OUTPUT_PATH):
+    """
+    Attributes the predicted price of `n_rows` listings, checks additivity
+    against model.predict, benchmarks the cost and saves the attributions.
+    """
+    print("--- Per-Listing Price Attribution ---")
+
+    if not all(os.path.exists(p) for p in [MODEL_PATH, FEATURES_PATH]):
+        print("Error: Required model or data files not found. Please run prior day scripts.")
+        return
+
+    try:
+        import joblib
+        model = joblib.load(MODEL_PATH)
+        X = pd.read_csv(FEATURES_PATH, nrows=n_rows)
+        print(f"Loaded the stacked model and {len(X)} encoded listings.")
+    except Exception as e:
+        print(f"Error loading files: {e}")
+        return
+
+    attributor = StackedAttributor(model, feature_names=X.columns)
+    weights = ', '.join(f"{name}={w:.3f}" for name, w in attributor.meta_weights.items())
+    print(f"Meta-learner weights: {weights}; intercept={attributor.meta_intercept:.3f}")
+    print("-" * 50)
+
+    # --- Task 1: Attribution & Additivity Check ---
+    print("\n[Task 1/3] Computing per-listing attributions...")
+    start = time.perf_counter()
+    predictions = model.predict(X)
+    predict_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    attributions = attributor.explain(X)
+    explain_seconds = time.perf_counter() - start
+
+    reconstructed = attributions.sum(axis=1).to_numpy()
+    print(f"Max |base_value + contributions - prediction|: {np.abs(reconstructed - predictions).max():.2e}")
+    print("-" * 50)
+
+    # --- Task 2: Cost vs. Plain Predict ---
+    print("\n[Task 2/3] Benchmarking against model.predict...")
+    cache = attributor.cached(model_fingerprint(MODEL_PATH))
+    cache.transform(X)
+    start = time.perf_counter()
+    cache.transform(X)
+    cached_seconds = time.perf_counter() - start
+    print(f"model.predict:          {predict_seconds * 1000:9.1f} ms ({predict_seconds / len(X) * 1e6:.1f} us/listing)")
+    print(f"attribution:            {explain_seconds * 1000:9.1f} ms "
+          f"({explain_seconds / predict_seconds:.1f}x predict)")
+    print(f"attribution (cached):   {cached_seconds * 1000:9.1f} ms; cache stats: {cache.stats()}")
+    print("-" * 50)
+
+    # --- Task 3: Save ---
+    print("\n[Task 3/3] Saving attributions and top drivers...")
+    drivers = top_drivers(attributions)
+    report = pd.concat([attributions, drivers], axis=1)
+    report['predicted_price'] = np.expm1(predictions)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    report.to_csv(output_path, index_label='row')
+    print(f"Attributions saved to '{output_path}'")
+    print(drivers.head(5))
+
+    print("\n--- Per-Listing Price Attribution Complete ---")
+    return attributions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-listing price attribution for the stacked model.')
+    parser.add_argument('--rows', type=int, default=5000, help='Rows of model_features.csv to attribute.')
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    args = parser.parse_args()
+    run_attribution_report(args.rows, args.output)
+
+
+if __name__ == '__main__':
+    main()
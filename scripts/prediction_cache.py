@@ -0,0 +1,303 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+MODEL_PATH = '../models/stacked_price_predictor.joblib'
+FEATURES_PATH = '../data/processed/model_features.csv'
+# Persistent cache file shared by scoring runs and worker processes
+SHARED_CACHE_PATH = '../models/prediction_cache.sqlite'
+
+
+def model_fingerprint(model_or_path):
+    """
+    Identifies a model version: the SHA-256 of a saved model file, or the
+    joblib hash of an in-memory estimator.
+    """
+    if isinstance(model_or_path, (str, os.PathLike)):
+        digest = hashlib.sha256()
+        with open(model_or_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    import joblib
+    return joblib.hash(model_or_path)
+
+
+def row_keys(X, columns=None):
+    """
+    Hashes each row of the canonical encoded feature vector to a uint64 key.
+    Columns are put in training order and values cast to float64 first, so
+    the same listing encoded as ints, bools or floats maps to the same key.
+    """
+    if columns is not None:
+        X = X.reindex(columns=columns, fill_value=0)
+    canonical = pd.DataFrame(X.to_numpy(dtype=np.float64), columns=X.columns)
+    return pd.util.hash_pandas_object(canonical, index=False).to_numpy(dtype=np.uint64)
+
+
+class LRUStore:
+    """
+    In-process bounded store: an OrderedDict in recency order with optional
+    per-entry TTL. Values are float64 vectors.
+    """
+
+    def __init__(self, max_entries=100_000, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_many(self, namespace, keys):
+        """Returns {key: value} for the keys that are present and not expired."""
+        now = time.time()
+        found = {}
+        for key in keys:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                continue
+            value, expires = entry
+            if expires is not None and expires < now:
+                del self._entries[(namespace, key)]
+                self.evictions += 1
+                continue
+            self._entries.move_to_end((namespace, key))
+            found[key] = value
+        return found
+
+    def put_many(self, namespace, items):
+        expires = time.time() + self.ttl if self.ttl else None
+        for key, value in items.items():
+            self._entries[(namespace, key)] = (value, expires)
+            self._entries.move_to_end((namespace, key))
+        overflow = len(self._entries) - self.max_entries
+        for _ in range(max(overflow, 0)):
+            self._entries.popitem(last=False)
+        self.evictions += max(overflow, 0)
+
+    def drop_namespace(self, namespace):
+        """Drops every entry stored under `namespace` (one model version)."""
+        for entry_key in [k for k in self._entries if k[0] == namespace]:
+            del self._entries[entry_key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+class SQLiteStore:
+    """
+    Process-shared store backed by a SQLite file in WAL mode, so several
+    scoring workers on one host read and fill the same cache. Recency is
+    tracked per row and the least recently used rows beyond `max_entries`
+    are deleted on write.
+    """
+
+    def __init__(self, path, max_entries=1_000_000, ttl=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            ' namespace TEXT NOT NULL, key INTEGER NOT NULL, value BLOB NOT NULL,'
+            ' expires REAL, last_used REAL NOT NULL, PRIMARY KEY (namespace, key))')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used)')
+
+    def __len__(self):
+        return self._conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    @staticmethod
+    def _to_sql(keys):
+        # SQLite integers are signed 64-bit; reinterpret the uint64 hashes
+        return np.asarray(keys, dtype=np.uint64).view(np.int64).tolist()
+
+    def get_many(self, namespace, keys):
+        now = time.time()
+        keys = list(keys)
+        sql_keys = self._to_sql(keys)
+        by_sql_key = dict(zip(sql_keys, keys))
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(sql_keys), 900):
+            batch = sql_keys[start:start + 900]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f'SELECT key, value FROM cache WHERE namespace = ? AND key IN ({placeholders})'
+                ' AND (expires IS NULL OR expires >= ?)', [namespace, *batch, now]).fetchall()
+            for sql_key, blob in rows:
+                found[by_sql_key[sql_key]] = np.frombuffer(blob, dtype=np.float64)
+            if rows:
+                self._conn.executemany('UPDATE cache SET last_used = ? WHERE namespace = ? AND key = ?',
+                                       [(now, namespace, sql_key) for sql_key, _ in rows])
+        return found
+
+    def put_many(self, namespace, items):
+        now = time.time()
+        expires = now + self.ttl if self.ttl else None
+        sql_keys = self._to_sql(list(items.keys()))
+        rows = [(namespace, k, np.asarray(v, dtype=np.float64).tobytes(), expires, now)
+                for k, v in zip(sql_keys, items.values())]
+        with self._conn:
+            self._conn.execute('BEGIN IMMEDIATE')
+            self._conn.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)', rows)
+            expired = self._conn.execute('DELETE FROM cache WHERE expires < ?', (now,)).rowcount
+            overflow = self._conn.execute(
+                'DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY last_used'
+                ' LIMIT max(0, (SELECT COUNT(*) FROM cache) - ?))', (self.max_entries,)).rowcount
+        self.evictions += max(expired, 0) + max(overflow, 0)
+
+    def drop_namespace(self, namespace):
+        self._conn.execute('DELETE FROM cache WHERE namespace = ?', (namespace,))
+
+    def drop_other_models(self, model_hash):
+        """
+        Deletes the entries of every model version except `model_hash`.
+        Namespaces are '<model hash>' or '<model hash>:<kind>' (e.g. attributions).
+        """
+        self._conn.execute('DELETE FROM cache WHERE namespace != ? AND substr(namespace, 1, ?) != ?',
+                           (model_hash, len(model_hash) + 1, model_hash + ':'))
+
+    def clear(self):
+        self._conn.execute('DELETE FROM cache')
+
+    def close(self):
+        self._conn.close()
+
+
+class PredictionCache:
+    """
+    Caches the output of `predict_fn` per row, keyed by the canonical
+    encoded feature vector and namespaced by the model hash.
+
+    `predict` looks every row up first and sends only the distinct missing
+    rows to `predict_fn`, in one batched call. Switching to a new model hash
+    (see `set_model`) drops the old model's entries. With `shared_path`, a
+    SQLite file shared between worker processes is used instead of the
+    in-process LRU; opening it for a model drops the entries of every other
+    model version, so workers are expected to serve one model at a time.
+    """
+
+    def __init__(self, predict_fn, model_hash, columns=None, max_entries=100_000, ttl=None, shared_path=None):
+        self.predict_fn = predict_fn
+        self.model_hash = model_hash
+        self.columns = list(columns) if columns is not None else None
+        if shared_path:
+            self.store = SQLiteStore(shared_path, max_entries=max_entries, ttl=ttl)
+            self.store.drop_other_models(model_hash.split(':')[0])
+        else:
+            self.store = LRUStore(max_entries=max_entries, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_model(cls, model, model_path=None, **kwargs):
+        """Wraps `model.predict`, fingerprinting the saved file when available."""
+        model_hash = model_fingerprint(model_path if model_path else model)
+        columns = kwargs.pop('columns', getattr(model, 'feature_names_in_', None))
+        return cls(model.predict, model_hash, columns=columns, **kwargs)
+
+    def set_model(self, predict_fn, model_hash):
+        """Points the cache at a new model; entries of the previous model are dropped."""
+        if model_hash != self.model_hash:
+            self.store.drop_namespace(self.model_hash)
+        self.predict_fn = predict_fn
+        self.model_hash = model_hash
+
+    def _lookup(self, X):
+        """
+        Returns (keys, cached) where `cached` maps key -> stored vector, and
+        fills in the misses by calling `predict_fn` once on the distinct rows.
+        """
+        keys = row_keys(X, self.columns)
+        unique_keys, first_rows = np.unique(keys, return_index=True)
+        cached = self.store.get_many(self.model_hash, unique_keys.tolist())
+
+        missing = np.array([k not in cached for k in unique_keys.tolist()], dtype=bool)
+        # Only rows served from the store are hits; repeats of a missing row are misses too
+        hits = int(np.isin(keys, unique_keys[~missing]).sum())
+        self.hits += hits
+        self.misses += len(keys) - hits
+
+        if missing.any():
+            rows = np.sort(first_rows[missing])
+            X_missing = X.iloc[rows]
+            if self.columns is not None:
+                X_missing = X_missing.reindex(columns=self.columns, fill_value=0)
+            values = np.asarray(self.predict_fn(X_missing), dtype=np.float64)
+            values = values.reshape(len(rows), -1)
+            new_items = {int(keys[r]): values[i] for i, r in enumerate(rows)}
+            self.store.put_many(self.model_hash, new_items)
+            cached.update(new_items)
+        return keys, cached
+
+    def predict(self, X):
+        """Drop-in for `model.predict`: one value per row, served from cache where possible."""
+        keys, cached = self._lookup(X)
+        return np.array([cached[k][0] for k in keys.tolist()], dtype=np.float64)
+
+    def transform(self, X):
+        """Like `predict` for functions that return a vector per row (e.g. attributions)."""
+        keys, cached = self._lookup(X)
+        return np.vstack([cached[k] for k in keys.tolist()]) if len(keys) else np.empty((0, 0))
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 4),
+            'evictions': self.store.evictions,
+            'entries': len(self.store),
+            'model_hash': self.model_hash[:12],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay encoded listings through the cached stacked model.')
+    parser.add_argument('--rows', type=int, default=5000, help='Rows of model_features.csv to replay.')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--max-entries', type=int, default=100_000)
+    parser.add_argument('--ttl', type=float, default=None, help='Entry lifetime in seconds.')
+    parser.add_argument('--shared', default=None, help='SQLite file for a cache shared between processes.')
+    args = parser.parse_args()
+
+    print("--- Prediction Cache Replay ---")
+    if not all(os.path.exists(p) for p in [MODEL_PATH, FEATURES_PATH]):
+        print("Error: Required model or data files not found. Please run prior day scripts.")
+        return
+
+    import joblib
+    model = joblib.load(MODEL_PATH)
+    X = pd.read_csv(FEATURES_PATH, nrows=args.rows)
+    cache = PredictionCache.for_model(model, MODEL_PATH, columns=X.columns, max_entries=args.max_entries,
+                                      ttl=args.ttl, shared_path=args.shared)
+
+    start = time.perf_counter()
+    model.predict(X)
+    uncached = time.perf_counter() - start
+    print(f"Uncached predict on {len(X)} rows: {uncached * 1000:.1f} ms")
+
+    for repeat in range(args.repeats):
+        start = time.perf_counter()
+        cache.predict(X)
+        print(f"Cached pass {repeat + 1}: {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"\nCache stats: {cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
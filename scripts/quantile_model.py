@@ -0,0 +1,166 @@
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMRegressor
+from sklearn.metrics import mean_absolute_error
+from backtesting import time_holdout_split
+
+POINT_MODEL_PATH = '../models/stacked_price_predictor.joblib'
+QUANTILE_MODEL_PATH = '../models/quantile_price_heads.joblib'
+QUANTILES = (0.1, 0.5, 0.9)
+
+
+def quantile_column(q):
+    return f'q{int(round(q * 100)):02d}'
+
+
+def build_quantile_heads(quantiles=QUANTILES, n_jobs=-1):
+    """
+    Returns one (unfitted) LightGBM quantile regressor per quantile, with
+    the same settings as the LightGBM base learner of the stacked model.
+    """
+    return {
+        q: LGBMRegressor(objective='quantile', alpha=q, n_estimators=100, random_state=42, n_jobs=n_jobs)
+        for q in quantiles
+    }
+
+
+class IntervalPricePredictor:
+    """
+    Serves the stacked model's point estimate and the quantile heads from
+    one call. The batch is aligned to the training columns once and that
+    single encoding is fed to every model.
+    """
+
+    def __init__(self, heads, feature_names, point_model=None):
+        self.heads = dict(sorted(heads.items()))
+        self.feature_names = list(feature_names)
+        self.point_model = point_model
+
+    @classmethod
+    def fit(cls, X, y, quantiles=QUANTILES, point_model=None, n_jobs=-1):
+        """Trains the quantile heads; returns the predictor and seconds spent per head."""
+        heads = build_quantile_heads(quantiles, n_jobs=n_jobs)
+        train_seconds = {}
+        for q, head in heads.items():
+            start = time.perf_counter()
+            head.fit(X, y)
+            train_seconds[quantile_column(q)] = time.perf_counter() - start
+        return cls(heads, X.columns, point_model), train_seconds
+
+    def predict(self, X):
+        """
+        Returns log1p(price) predictions: 'point' (when a point model is
+        attached) and one column per quantile. Quantiles are sorted per row
+        so independently trained heads never cross.
+        """
+        X = X.reindex(columns=self.feature_names, fill_value=0)
+        quantiles = np.column_stack([head.predict(X) for head in self.heads.values()])
+        quantiles.sort(axis=1)
+        result = pd.DataFrame(quantiles, columns=[quantile_column(q) for q in self.heads], index=X.index)
+        if self.point_model is not None:
+            result.insert(0, 'point', self.point_model.predict(X))
+        return result
+
+    def predict_prices(self, X):
+        """Same as `predict`, in dollars."""
+        return np.expm1(self.predict(X))
+
+    def save(self, path=QUANTILE_MODEL_PATH):
+        # The point model is saved by Day 8; only the heads are stored here
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump({'heads': self.heads, 'feature_names': self.feature_names}, path)
+        return path
+
+    @classmethod
+    def load(cls, path=QUANTILE_MODEL_PATH, point_model_path=POINT_MODEL_PATH):
+        data = joblib.load(path)
+        point_model = joblib.load(point_model_path) if point_model_path and os.path.exists(point_model_path) else None
+        return cls(data['heads'], data['feature_names'], point_model)
+
+
+def pinball_loss(y_true, y_pred, q):
+    diff = np.asarray(y_true) - np.asarray(y_pred)
+    return float(np.mean(np.maximum(q * diff, (q - 1) * diff)))
+
+
+def train_quantile_model():
+    """
+    Trains the quantile heads on the Day 7 features, evaluates interval
+    coverage on the hold-out set and reports cost and latency against the
+    point model.
+    """
+    print("--- Training Quantile Price Interval Model ---")
+
+    features_path = '../data/processed/model_features.csv'
+    target_path = '../data/processed/model_target.csv'
+
+    if not all(os.path.exists(f) for f in [features_path, target_path]):
+        print("Error: Feature or target files not found. Please run the Day 7 script first.")
+        return
+
+    try:
+        X = pd.read_csv(features_path)
+        y = pd.read_csv(target_path).iloc[:, 0]
+        print("Successfully loaded features and target data.")
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return
+
+    point_model = joblib.load(POINT_MODEL_PATH) if os.path.exists(POINT_MODEL_PATH) else None
+    if point_model is None:
+        print(f"Note: No point model at '{POINT_MODEL_PATH}'; reporting the quantile heads alone.")
+
+    # --- Task 1: Train-Test Split ---
+    print("\n[Task 1/4] Splitting data into training (80%) and testing (20%) sets by review time...")
+    X_train, X_test, y_train, y_test = time_holdout_split(X, y, test_size=0.2)
+    print("-" * 50)
+
+    # --- Task 2: Train the Quantile Heads ---
+    print(f"\n[Task 2/4] Training LightGBM quantile heads {[quantile_column(q) for q in QUANTILES]}...")
+    predictor, train_seconds = IntervalPricePredictor.fit(X_train, y_train, point_model=point_model)
+    for name, seconds in train_seconds.items():
+        print(f"  {name}: {seconds:.2f}s")
+    print(f"Total quantile training time: {sum(train_seconds.values()):.2f}s")
+    print("-" * 50)
+
+    # --- Task 3: Interval Quality ---
+    print("\n[Task 3/4] Evaluating intervals on the test set...")
+    intervals = predictor.predict(X_test)
+    low, mid, high = (intervals[quantile_column(q)] for q in (QUANTILES[0], 0.5, QUANTILES[-1]))
+    coverage = ((y_test >= low) & (y_test <= high)).mean()
+    nominal = QUANTILES[-1] - QUANTILES[0]
+    print(f"Coverage of [{low.name}, {high.name}]: {coverage:.1%} (nominal {nominal:.0%})")
+    for q in QUANTILES:
+        print(f"  Pinball loss {quantile_column(q)}: {pinball_loss(y_test, intervals[quantile_column(q)], q):.4f}")
+
+    prices = np.expm1(intervals)
+    actual = np.expm1(y_test)
+    print(f"Median-head MAE: ${mean_absolute_error(actual, prices[mid.name]):.2f}")
+    if 'point' in prices:
+        print(f"Point-model MAE: ${mean_absolute_error(actual, prices['point']):.2f}")
+    print(f"Median interval width: ${(prices[high.name] - prices[low.name]).median():.2f}")
+    print("-" * 50)
+
+    # --- Task 4: Serving Latency ---
+    print("\n[Task 4/4] Comparing batched serving latency...")
+    batch = X_test.iloc[:1000]
+    if point_model is not None:
+        start = time.perf_counter()
+        point_model.predict(batch)
+        point_ms = (time.perf_counter() - start) * 1000
+        print(f"Point model only:          {point_ms:8.1f} ms / {len(batch)} rows")
+    start = time.perf_counter()
+    predictor.predict(batch)
+    interval_ms = (time.perf_counter() - start) * 1000
+    print(f"Point + quantile heads:    {interval_ms:8.1f} ms / {len(batch)} rows")
+
+    model_path = predictor.save()
+    print(f"\nQuantile heads saved to '{model_path}'")
+    print("\n--- Quantile Price Interval Model Complete ---")
+
+
+if __name__ == '__main__':
+    train_quantile_model()
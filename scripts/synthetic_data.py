@@ -0,0 +1,243 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Number of listings in the cleaned NYC extract; scale factors are relative to it
+BASE_CLEANED_ROWS = 81_781
+# Number of listings in the raw NYC extract before Day 2 cleaning
+BASE_RAW_ROWS = 102_599
+
+# Borough shares of the cleaned data, with a few representative
+# neighbourhoods per borough as (name, lat, long, weight)
+BOROUGHS = {
+    'Manhattan': (0.425, [
+        ('Harlem', 40.8116, -73.9465, 0.20), ('Upper West Side', 40.7870, -73.9754, 0.16),
+        ('Hell\'s Kitchen', 40.7638, -73.9918, 0.15), ('East Village', 40.7265, -73.9815, 0.14),
+        ('Upper East Side', 40.7736, -73.9566, 0.14), ('Midtown', 40.7549, -73.9840, 0.11),
+        ('Chelsea', 40.7465, -74.0014, 0.10),
+    ]),
+    'Brooklyn': (0.421, [
+        ('Bedford-Stuyvesant', 40.6872, -73.9418, 0.28), ('Williamsburg', 40.7081, -73.9571, 0.26),
+        ('Bushwick', 40.6958, -73.9171, 0.18), ('Crown Heights', 40.6694, -73.9422, 0.16),
+        ('Park Slope', 40.6710, -73.9814, 0.12),
+    ]),
+    'Queens': (0.114, [
+        ('Astoria', 40.7644, -73.9235, 0.35), ('Long Island City', 40.7447, -73.9485, 0.25),
+        ('Flushing', 40.7675, -73.8331, 0.20), ('Jamaica', 40.7027, -73.7890, 0.20),
+    ]),
+    'Bronx': (0.029, [
+        ('Mott Haven', 40.8091, -73.9229, 0.40), ('Concourse', 40.8270, -73.9228, 0.35),
+        ('Fordham', 40.8615, -73.8905, 0.25),
+    ]),
+    'Staten Island': (0.011, [
+        ('St. George', 40.6437, -74.0736, 0.55), ('Tompkinsville', 40.6366, -74.0826, 0.45),
+    ]),
+}
+
+ROOM_TYPES = {'Entire home/apt': 0.496, 'Private room': 0.479, 'Shared room': 0.022, 'Hotel room': 0.003}
+
+# Relative price levels used to give the synthetic prices a learnable structure
+BOROUGH_PRICE_FACTOR = {'Manhattan': 1.10, 'Brooklyn': 1.00, 'Queens': 0.95, 'Bronx': 0.90, 'Staten Island': 0.90}
+ROOM_PRICE_FACTOR = {'Entire home/apt': 1.10, 'Private room': 0.90, 'Shared room': 0.80, 'Hotel room': 1.05}
+
+# Relative number of reviews left in each calendar month (summer/autumn peak)
+MONTH_WEIGHTS = np.array([0.55, 0.50, 0.60, 0.70, 0.85, 1.20, 1.40, 1.30, 1.20, 1.10, 0.80, 0.80])
+
+HOST_FIRST_NAMES = ['Michael', 'David', 'John', 'Alex', 'Sonder (NYC)', 'Maria', 'Daniel', 'Sarah',
+                    'James', 'Jessica', 'Blueground', 'Anna', 'Chris', 'Laura', 'Kara', 'Jenna']
+NAME_ADJECTIVES = ['Cozy', 'Spacious', 'Sunny', 'Modern', 'Charming', 'Quiet', 'Bright', 'Luxury']
+NAME_PLACES = ['room', 'studio', 'apartment', 'loft', 'bedroom', 'duplex']
+
+# Raw (pre-Day 2) column names, in the order of the original Excel export
+RAW_COLUMN_NAMES = {
+    'id': 'id', 'name': 'NAME', 'host_id': 'host id', 'host_identity_verified': 'host_identity_verified',
+    'host_name': 'host name', 'neighbourhood_group': 'neighbourhood group', 'neighbourhood': 'neighbourhood',
+    'lat': 'lat', 'long': 'long', 'country': 'country', 'country_code': 'country code',
+    'instant_bookable': 'instant_bookable', 'cancellation_policy': 'cancellation_policy',
+    'room_type': 'room type', 'construction_year': 'Construction year', 'price': 'price',
+    'service_fee': 'service fee', 'minimum_nights': 'minimum nights', 'number_of_reviews': 'number of reviews',
+    'last_review': 'last review', 'reviews_per_month': 'reviews per month',
+    'review_rate_number': 'review rate number',
+    'calculated_host_listings_count': 'calculated host listings count',
+    'availability_365': 'availability 365', 'house_rules': 'house_rules', 'license': 'license',
+}
+
+# Approximate share of missing values per raw column in the NYC extract
+RAW_NULL_RATES = {
+    'name': 0.003, 'host_identity_verified': 0.003, 'host_name': 0.004, 'neighbourhood_group': 0.0003,
+    'neighbourhood': 0.0002, 'lat': 0.0001, 'long': 0.0001, 'instant_bookable': 0.001,
+    'cancellation_policy': 0.001, 'construction_year': 0.002, 'price': 0.002, 'service_fee': 0.003,
+    'minimum_nights': 0.004, 'number_of_reviews': 0.002, 'review_rate_number': 0.003,
+    'calculated_host_listings_count': 0.003, 'availability_365': 0.004,
+}
+
+
+def _choice(rng, options, n):
+    labels = list(options)
+    weights = np.array(list(options.values()), dtype=np.float64)
+    return np.asarray(labels, dtype=object)[rng.choice(len(labels), size=n, p=weights / weights.sum())]
+
+
+def generate_listings(n_rows, seed=42, start_id=1001254):
+    """
+    Generates `n_rows` synthetic listings with the schema and approximate
+    value distributions of the Day 2 cleaned NYC dataset.
+    """
+    rng = np.random.default_rng(seed)
+
+    # --- Location: borough, neighbourhood and a jittered lat/long cluster ---
+    borough = _choice(rng, {b: share for b, (share, _) in BOROUGHS.items()}, n_rows)
+    neighbourhood = np.empty(n_rows, dtype=object)
+    lat = np.empty(n_rows)
+    long = np.empty(n_rows)
+    for name, (_, hoods) in BOROUGHS.items():
+        mask = borough == name
+        count = int(mask.sum())
+        if not count:
+            continue
+        weights = np.array([h[3] for h in hoods])
+        picks = rng.choice(len(hoods), size=count, p=weights / weights.sum())
+        neighbourhood[mask] = np.array([h[0] for h in hoods], dtype=object)[picks]
+        lat[mask] = np.array([h[1] for h in hoods])[picks] + rng.normal(0, 0.008, count)
+        long[mask] = np.array([h[2] for h in hoods])[picks] + rng.normal(0, 0.008, count)
+
+    room_type = _choice(rng, ROOM_TYPES, n_rows)
+
+    # --- Hosts: a heavy-tailed portfolio size distribution creates power hosts ---
+    n_hosts = max(1, int(n_rows * 0.8))
+    host_rank = np.minimum(rng.zipf(2.2, size=n_rows), n_hosts) - 1
+    host_slot = np.where(rng.random(n_rows) < 0.5, host_rank, rng.integers(0, n_hosts, n_rows))
+    host_id = 10_000_000_000 + host_slot.astype(np.int64) * 7919 + seed % 7919
+    host_name = np.asarray(HOST_FIRST_NAMES, dtype=object)[host_slot % len(HOST_FIRST_NAMES)]
+    listings_per_host = pd.Series(host_id).map(pd.Series(host_id).value_counts()).to_numpy()
+
+    # --- Price: the extract is close to uniform on $50-$1,200 with service fee at 20% ---
+    base_price = rng.uniform(50, 1200, n_rows)
+    factor = (pd.Series(borough).map(BOROUGH_PRICE_FACTOR).to_numpy()
+              * pd.Series(room_type).map(ROOM_PRICE_FACTOR).to_numpy())
+    price = np.clip(np.round(base_price * factor), 50, 1200)
+    service_fee = np.round(price * 0.2)
+
+    # --- Stay and review activity ---
+    minimum_nights = np.where(rng.random(n_rows) < 0.66, rng.integers(1, 4, n_rows),
+                              rng.choice([4, 5, 7, 14, 30, 60, 365], size=n_rows,
+                                         p=[0.25, 0.2, 0.2, 0.1, 0.2, 0.03, 0.02])).astype(np.float64)
+    number_of_reviews = rng.negative_binomial(0.6, 0.022, n_rows).astype(np.float64)
+
+    years = np.arange(2012, 2023)
+    year_weights = np.linspace(0.2, 1.0, len(years)) ** 2
+    review_year = rng.choice(years, size=n_rows, p=year_weights / year_weights.sum())
+    review_month = rng.choice(12, size=n_rows, p=MONTH_WEIGHTS / MONTH_WEIGHTS.sum()) + 1
+    review_day = rng.integers(1, 29, n_rows)
+    last_review = pd.to_datetime(pd.DataFrame({'year': review_year, 'month': review_month, 'day': review_day}))
+
+    months_active = np.maximum(1.0, rng.gamma(2.0, 12.0, n_rows))
+    reviews_per_month = np.round(number_of_reviews / months_active, 2)
+
+    df = pd.DataFrame({
+        'id': np.arange(start_id, start_id + n_rows, dtype=np.int64),
+        'name': [f'{a} {p} in {h}' for a, p, h in zip(
+            np.asarray(NAME_ADJECTIVES, dtype=object)[rng.integers(0, len(NAME_ADJECTIVES), n_rows)],
+            np.asarray(NAME_PLACES, dtype=object)[rng.integers(0, len(NAME_PLACES), n_rows)],
+            neighbourhood)],
+        'host_id': host_id,
+        'host_identity_verified': np.where(rng.random(n_rows) < 0.5, 'verified', 'unconfirmed'),
+        'host_name': host_name,
+        'neighbourhood_group': borough,
+        'neighbourhood': neighbourhood,
+        'lat': np.round(lat, 5),
+        'long': np.round(long, 5),
+        'instant_bookable': (rng.random(n_rows) < 0.5).astype(np.float64),
+        'cancellation_policy': _choice(rng, {'moderate': 0.34, 'strict': 0.33, 'flexible': 0.33}, n_rows),
+        'room_type': room_type,
+        'construction_year': rng.integers(2003, 2023, n_rows).astype(np.float64),
+        'price': price,
+        'service_fee': service_fee,
+        'minimum_nights': minimum_nights,
+        'number_of_reviews': number_of_reviews,
+        'last_review': last_review,
+        'reviews_per_month': reviews_per_month,
+        'review_rate_number': rng.integers(1, 6, n_rows).astype(np.float64),
+        'calculated_host_listings_count': listings_per_host.astype(np.float64),
+        'availability_365': rng.integers(0, 366, n_rows).astype(np.float64),
+    })
+    return df
+
+
+def to_raw_format(df, seed=42):
+    """
+    Converts cleaned-schema listings into the raw Excel layout that Day 2
+    expects: original column names, the dropped columns, missing values and
+    a small share of invalid records.
+    """
+    rng = np.random.default_rng(seed)
+    raw = df.copy()
+    n_rows = len(raw)
+
+    raw['country'] = 'United States'
+    raw['country_code'] = 'US'
+    raw['house_rules'] = np.where(rng.random(n_rows) < 0.47, 'No smoking. No parties.', None)
+    raw['license'] = None
+
+    # Listings without reviews have no review date or monthly rate
+    no_reviews = rng.random(n_rows) < 0.15
+    raw.loc[no_reviews, 'number_of_reviews'] = 0.0
+    raw.loc[no_reviews, 'last_review'] = pd.NaT
+    raw.loc[no_reviews, 'reviews_per_month'] = np.nan
+
+    for col, rate in RAW_NULL_RATES.items():
+        raw.loc[rng.random(n_rows) < rate, col] = np.nan
+
+    # Invalid values that the Day 2 filters are expected to remove
+    raw.loc[rng.random(n_rows) < 0.003, 'minimum_nights'] = -rng.integers(1, 10)
+    raw.loc[rng.random(n_rows) < 0.004, 'availability_365'] = rng.choice([-10.0, 400.0, 3677.0])
+
+    raw = raw[list(RAW_COLUMN_NAMES)]
+    return raw.rename(columns=RAW_COLUMN_NAMES)
+
+
+def iter_synthetic_chunks(n_rows, seed=42, chunk_size=500_000, raw=False):
+    """
+    Yields the synthetic dataset in chunks so very large scales can be
+    written without holding the full frame in memory. Each chunk gets its
+    own child seed, so the output only depends on `seed` and `chunk_size`.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(max(1, -(-n_rows // chunk_size)))
+    start_id = 1001254
+    for i, offset in enumerate(range(0, n_rows, chunk_size)):
+        rows = min(chunk_size, n_rows - offset)
+        chunk_seed = int(seeds[i].generate_state(1)[0])
+        chunk = generate_listings(rows, seed=chunk_seed, start_id=start_id + offset)
+        yield to_raw_format(chunk, seed=chunk_seed) if raw else chunk
+
+
+def write_synthetic_csv(path, n_rows, seed=42, chunk_size=500_000, raw=False):
+    """Writes `n_rows` synthetic listings to a CSV file chunk by chunk."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    for i, chunk in enumerate(iter_synthetic_chunks(n_rows, seed, chunk_size, raw)):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic NYC-like Airbnb listings.')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help=f'Size relative to the NYC extract ({BASE_CLEANED_ROWS:,} cleaned rows).')
+    parser.add_argument('--raw', action='store_true', help='Write the raw pre-cleaning layout.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help='Output CSV path.')
+    args = parser.parse_args()
+
+    base_rows = BASE_RAW_ROWS if args.raw else BASE_CLEANED_ROWS
+    n_rows = int(base_rows * args.scale)
+    kind = 'raw' if args.raw else 'cleaned'
+    output = args.output or f'../data/synthetic/synthetic_{kind}_{args.scale:g}x.csv'
+
+    print(f"Generating {n_rows:,} synthetic {kind} listings (seed={args.seed})...")
+    write_synthetic_csv(output, n_rows, seed=args.seed, raw=args.raw)
+    print(f"Synthetic data saved to '{output}'")
+
+
+if __name__ == '__main__':
+    main()
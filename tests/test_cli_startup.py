@@ -0,0 +1,36 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import airbnb_cli  # noqa: E402
+
+BUDGET_SECONDS = 2.0
+CLI_BUDGET_SECONDS = 0.2
+
+
+def test_startup_check_passes_for_bare_cli():
+    assert airbnb_cli.startup_check(['cli'], budget=BUDGET_SECONDS, cli_budget=CLI_BUDGET_SECONDS) == 0
+
+
+@pytest.mark.parametrize('command', list(airbnb_cli.COMMAND_IMPORTS))
+def test_command_startup_within_budget(command):
+    runs = [airbnb_cli._measure_startup(command) for _ in range(3)]
+    errors = [run['error'] for run in runs if 'error' in run]
+    if errors and 'ModuleNotFoundError' in errors[0]:
+        pytest.skip(f"dependency not installed: {errors[0]}")
+    assert not errors, errors[0] if errors else ''
+
+    budget = CLI_BUDGET_SECONDS if command == 'cli' else BUDGET_SECONDS
+    assert min(run['seconds'] for run in runs) <= budget
+    assert not set(airbnb_cli.STARTUP_FORBIDDEN[command]) & set(runs[0]['modules'])
+
+
+def test_pass_through_paths_resolved_from_caller_cwd(tmp_path):
+    cwd = str(tmp_path)
+    assert airbnb_cli._resolve_path_arg('out.csv', cwd) == os.path.join(cwd, 'out.csv')
+    assert airbnb_cli._resolve_path_arg('--output=out.csv', cwd) == '--output=' + os.path.join(cwd, 'out.csv')
+    assert airbnb_cli._resolve_path_arg('/abs/out.csv', cwd) == '/abs/out.csv'
+    for arg in ['build', '100', '--folds', '0.5']:
+        assert airbnb_cli._resolve_path_arg(arg, cwd) == arg